@@ -1,11 +1,16 @@
-import uuid
 import time
+import math
+import threading
 from typing import Dict, List, Any, Optional, Tuple
 from src.models.cooperative_fund import CooperativeFund, FundStatus, FundContribution, InvestmentEvaluation
 from src.models.impact import ImpactVector, ImpactProjection, SurplusPool
 from src.engine.ledger import ContextualizedLedgerEngine
 from src.engine.surplus import CooperativeSurplusEngine
-from src.models.ledger import EntryType, CreditProvenance, CreditEntry
+from src.models.ledger import EntryType, CreditProvenance, CreditEntry, new_entry_id
+
+def _r4(value: float) -> float:
+    """Rounds a reported evaluation figure to 4 decimal places."""
+    return round(value, 4)
 
 class CooperativeInvestingEngine:
     """
@@ -17,6 +22,8 @@ class CooperativeInvestingEngine:
         self.ledger = ledger_engine
         self.surplus_engine = surplus_engine
         self.funds: Dict[str, CooperativeFund] = {}
+        # Serializes the balance check and the ledger write of each allocation
+        self._allocation_lock = threading.Lock()
 
     def create_fund(self, fund_id: str, target_objective: ImpactVector) -> CooperativeFund:
         """
@@ -31,27 +38,45 @@ class CooperativeInvestingEngine:
         Agents allocate credits from their balance into a shared CooperativeFund.
         Ensures economic traceability by tagging the transaction with the fund objective.
         """
-        if fund_id not in self.funds:
+        fund = self.funds.get(fund_id)
+        if fund is None:
             return False
-            
-        fund = self.funds[fund_id]
+
+        with self._allocation_lock:
+            return self._allocate(fund, agent_id, amount)
+
+    def allocate_credits_to_fund_many(self, fund_id: str, agent_id: str, amounts: List[float]) -> List[bool]:
+        """
+        Applies several allocations from one agent to a fund under a single lock
+        acquisition. Each amount is checked against the balance left by the previous
+        ones; returns the per-allocation results in order.
+        """
+        fund = self.funds.get(fund_id)
+        if fund is None:
+            return [False] * len(amounts)
+
+        with self._allocation_lock:
+            return [self._allocate(fund, agent_id, amount) for amount in amounts]
+
+    def _allocate(self, fund: CooperativeFund, agent_id: str, amount: float) -> bool:
+        """Single allocation; the caller holds the allocation lock."""
+        fund_id = fund.fund_id
         if fund.status != FundStatus.OPEN:
             return False
 
         # 1. Verify agent balance
-        balance = self.ledger.get_agent_balance(agent_id)
-        if balance.total_balance < amount:
+        if self.ledger.get_agent_total(agent_id) < amount:
             return False
 
         # 2. Debit the agent via ledger
         category = fund.target_objective.category
         
         provenance = CreditProvenance(
-            surplus_event_id=f"COOP_FUND_INVESTMENT_{fund_id}"
+            surplus_event_id=fund.investment_event_id
         )
 
         debit_entry = CreditEntry(
-            entry_id=str(uuid.uuid4()),
+            entry_id=new_entry_id(),
             agent_id=agent_id,
             amount=-amount,
             entry_type=EntryType.DEBIT,
@@ -62,10 +87,9 @@ class CooperativeInvestingEngine:
         )
         
         # Credit the fund account (represented as a specifically scoped system account)
-        fund_account = f"FUND_{fund_id}"
         credit_entry = CreditEntry(
-            entry_id=str(uuid.uuid4()),
-            agent_id=fund_account,
+            entry_id=new_entry_id(),
+            agent_id=fund.account_id,
             amount=amount,
             entry_type=EntryType.CREDIT,
             impact_vector=fund.target_objective,
@@ -74,9 +98,9 @@ class CooperativeInvestingEngine:
             metadata={"fund_id": fund_id, "contribution_type": "pooling_credit"}
         )
 
-        # Internal method usage to bypass high-level allocation logic
-        self.ledger._add_entry(debit_entry)
-        self.ledger._add_entry(credit_entry)
+        # Internal method usage to bypass high-level allocation logic;
+        # both sides of the transfer land together
+        self.ledger._add_entries_bulk((debit_entry, credit_entry))
 
         # 3. Update fund record
         contribution = FundContribution(
@@ -84,7 +108,7 @@ class CooperativeInvestingEngine:
             amount=amount,
             timestamp=time.time()
         )
-        fund.contributions.append(contribution)
+        fund.add_contribution(contribution)
         
         return True
 
@@ -105,16 +129,17 @@ class CooperativeInvestingEngine:
         
         # 2. Calculate ROCI (Return on Cooperative Investment)
         # Measure value generated per unit of pooled capital
-        roci = expected_return / investment_cost if investment_cost > 0 else 0.0
+        # An empty fund divides by an infinite sentinel, yielding a ROCI of 0.0
+        roci = expected_return / (investment_cost if investment_cost > 0.0 else math.inf)
         
         # 3. Risk Score calculation
         # Risk factors: Confidence interval width (low confidence) and dependency risk
-        mu = surplus_pool.total_surplus
+        mu = expected_return
         low, high = surplus_pool.confidence_interval
         ci_width = high - low
         
-        # Normalized confidence risk (0 to 1)
-        confidence_risk = min(1.0, ci_width / (mu * 2) if mu > 0 else 1.0)
+        # Normalized confidence risk (0 to 1); a non-positive expected surplus is maximal risk
+        confidence_risk = min(1.0, ci_width / (mu * 2.0)) if mu > 0.0 else 1.0
         
         # Dependency risk (from surplus engine metadata)
         # risk_discount = 1.0 / (1.0 + external_deps * factor)
@@ -122,7 +147,7 @@ class CooperativeInvestingEngine:
         dependency_risk = 1.0 - surplus_pool.metadata.get("risk_discount", 1.0)
         
         # Combined Risk Score (Weighted average)
-        risk_score = round((confidence_risk * 0.6) + (dependency_risk * 0.4), 4)
+        risk_score = _r4((confidence_risk * 0.6) + (dependency_risk * 0.4))
         
         # 4. Recommendation logic based on ROCI/Risk profiles
         if roci > 2.5 and risk_score < 0.35:
@@ -135,10 +160,10 @@ class CooperativeInvestingEngine:
         return InvestmentEvaluation(
             fund_id=fund_id,
             cluster_id=cluster_id,
-            expected_return=round(expected_return, 4),
-            investment_cost=round(investment_cost, 4),
+            expected_return=_r4(expected_return),
+            investment_cost=_r4(investment_cost),
             risk_score=risk_score,
-            roci=round(roci, 4),
+            roci=_r4(roci),
             confidence_interval=surplus_pool.confidence_interval,
             recommendation=rec,
             metadata=surplus_pool.metadata
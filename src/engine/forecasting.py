@@ -1,20 +1,27 @@
 import random
 import math
-from typing import List, Dict, Any, Tuple
-from src.models.impact import ImpactVector, ImpactProjection, ImpactCategory
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterable, Mapping, Tuple, Optional
+from src.models.impact import ImpactVector, ImpactProjection, ImpactCategory, IMPACT_CATEGORIES, IMPACT_CATEGORY_INDEX
 from src.models.registry import ImpactMetricRegistry
 from src.models.task import Task
 
+# Dense integer ids for impact categories, used by the flattened rule tables
+_CATEGORIES = IMPACT_CATEGORIES
+_CATEGORY_INDEX = IMPACT_CATEGORY_INDEX
+
 class ForecastingLayer:
     """
     Forecasting layer that applies domain-specific predictive models and
     simulates downstream effects using causal graph traversal.
     """
-    def __init__(self, registry: ImpactMetricRegistry):
+    def __init__(self, registry: ImpactMetricRegistry, seed: Optional[int] = None):
         self.registry = registry
+        # Dedicated generator for all Monte Carlo draws (seedable for reproducibility)
+        self._rng = random.Random(seed)
         # Causal transitions: (source_category) -> List[(target_category, probability, multiplier)]
         # This represents how one type of impact tends to cause another.
-        self.causal_rules: Dict[ImpactCategory, List[Tuple[ImpactCategory, float, float]]] = {
+        self.causal_rules = {
             ImpactCategory.TECHNICAL: [
                 (ImpactCategory.EFFICIENCY, 0.8, 1.2),
                 (ImpactCategory.ECOSYSTEM, 0.3, 0.5)
@@ -33,9 +40,56 @@ class ForecastingLayer:
             ]
         }
 
-    def project(self, task: Task) -> ImpactProjection:
+    @property
+    def causal_rules(self) -> Mapping[ImpactCategory, Tuple[Tuple[ImpactCategory, float, float], ...]]:
+        """
+        Read-only view of the causal transitions. Replace them by assigning a new
+        mapping (which recompiles the rule tables) or adjust single transitions
+        with update_causal_rule; in-place edits raise TypeError.
+        """
+        return MappingProxyType(self._causal_rules)
+
+    @causal_rules.setter
+    def causal_rules(self, rules: Mapping[ImpactCategory, Iterable[Tuple[ImpactCategory, float, float]]]):
+        self._causal_rules = {source: tuple(map(tuple, transitions)) for source, transitions in rules.items()}
+        self._compile_rules()
+
+    def _compile_rules(self):
+        """
+        Flattens the causal rules into CSR-style tables indexed by category id.
+        Rules for source id `s` live at positions offsets[s]:offsets[s + 1].
+        The structure (offsets/targets) is fixed until the rules are replaced; the probability
+        and multiplier columns are updated in place by update_causal_rule, which
+        finds its rows through the (source id, target id) index.
+        """
+        offsets = [0]
+        targets: List[int] = []
+        probs: List[float] = []
+        mults: List[float] = []
+        rule_index: Dict[Tuple[int, int], List[int]] = {}
+        for source, category in enumerate(_CATEGORIES):
+            for target_cat, prob, multiplier in self._causal_rules.get(category, ()):
+                target = _CATEGORY_INDEX[target_cat]
+                rule_index.setdefault((source, target), []).append(len(targets))
+                targets.append(target)
+                probs.append(prob)
+                mults.append(multiplier)
+            offsets.append(len(targets))
+
+        self._rule_offsets = offsets
+        self._rule_targets = targets
+        self._rule_probs = probs
+        self._rule_mults = mults
+        self._rule_index = {pair: tuple(rows) for pair, rows in rule_index.items()}
+
+    def project(self, task: Task, simulations: int = 100, rel_se_target: Optional[float] = 0.02) -> ImpactProjection:
         """
         Transforms a task into an ImpactProjection.
+
+        :param simulations: Maximum number of Monte Carlo simulations.
+        :param rel_se_target: Stop early once the standard error of the mean falls below
+                              this fraction of the mean (checked every 16 samples).
+                              None or 0 always runs all simulations.
         """
         task_id = task.id
         domain = task.domain
@@ -58,51 +112,53 @@ class ForecastingLayer:
             )
 
         # 2. Simulate downstream effects (Causal Graph Traversal)
-        # We simulate multiple paths to build a distribution
-        simulations = 100
-        total_impact_samples = []
-        all_effect_chains = []
-
-        for _ in range(simulations):
-            # Sample the first-order magnitude from its uncertainty bounds
-            low, high = first_order_vector.uncertainty_bounds
-            if low < high:
-                sampled_mag = random.uniform(low, high)
-            else:
-                sampled_mag = first_order_vector.magnitude
-            
-            # Create a localized version of the first-order vector for this simulation
-            base_vector = ImpactVector(
-                category=first_order_vector.category,
-                magnitude=sampled_mag,
-                time_horizon=first_order_vector.time_horizon,
-                uncertainty_bounds=first_order_vector.uncertainty_bounds,
-                causal_dependencies=first_order_vector.causal_dependencies,
-                domain_weights=first_order_vector.domain_weights,
-                metrics=first_order_vector.metrics
-            )
+        # We simulate multiple paths to build a distribution.
+        simulations = max(1, simulations)
+        low, high = first_order_vector.uncertainty_bounds
+        if low < high:
+            first_mag = self._rng.uniform(low, high)
+        else:
+            first_mag = first_order_vector.magnitude
 
-            chain = self._simulate_chain(base_vector, max_orders=3)
-            all_effect_chains.append(chain)
-            
-            # Sum up magnitudes (simplified impact aggregation)
-            total_mag = sum(v.magnitude for v in chain)
-            total_impact_samples.append(total_mag)
+        # Representative chain: the first simulation is materialized as ImpactVectors
+        # so it can be persisted in the projection metadata.
+        base_vector = ImpactVector(
+            category=first_order_vector.category,
+            magnitude=first_mag,
+            time_horizon=first_order_vector.time_horizon,
+            uncertainty_bounds=first_order_vector.uncertainty_bounds,
+            causal_dependencies=first_order_vector.causal_dependencies,
+            domain_weights=first_order_vector.domain_weights,
+            metrics=first_order_vector.metrics
+        )
+        representative_chain = self._simulate_chain(base_vector, max_orders=3)
 
+        # The remaining simulations only contribute to the distribution moments,
+        # so they run as one batch without materializing any chains or totals.
+        # Moments are shifted by the representative total to avoid cancellation
+        # when the spread is small.
+        shift = sum(v.magnitude for v in representative_chain)
+        extra_runs, delta_sum, delta_sq_sum = self._run_simulations(
+            simulations - 1,
+            first_order_vector.category,
+            first_order_vector.magnitude,
+            (low, high),
+            max_orders=3,
+            shift=shift,
+            rel_se_target=rel_se_target
+        )
+        simulations = extra_runs + 1
 
         # 3. Probabilistic Distribution & Confidence Intervals
-        mean = sum(total_impact_samples) / simulations
-        variance = sum((x - mean) ** 2 for x in total_impact_samples) / simulations
+        delta_mean = delta_sum / simulations
+        mean = shift + delta_mean
+        variance = max(0.0, delta_sq_sum / simulations - delta_mean * delta_mean)
         std = math.sqrt(variance)
         
         # 95% confidence interval (approximate using 1.96 * std)
         ci_low = mean - 1.96 * std
         ci_high = mean + 1.96 * std
 
-        # Representative chain (the first one or an average one)
-        # For metadata, we persist the first simulation's chain as an example
-        representative_chain = all_effect_chains[0]
-
         return ImpactProjection(
             task_id=task_id,
             target_vector=first_order_vector,
@@ -116,43 +172,148 @@ class ForecastingLayer:
             }
         )
 
+    def project_batch(self, tasks: List[Task], simulations: int = 100,
+                      rel_se_target: Optional[float] = 0.02) -> List[ImpactProjection]:
+        """
+        Projects a batch of tasks in order, drawing from the same generator as project(),
+        so a seeded layer yields the same projections as projecting one task at a time.
+        """
+        project = self.project
+        return [project(task, simulations, rel_se_target) for task in tasks]
+
     def _simulate_chain(self, start_vector: ImpactVector, max_orders: int) -> List[ImpactVector]:
         """
         Traverses the causal graph starting from an initial vector.
+        The traversal itself runs on the flattened rule tables; ImpactVectors
+        are only built here, from the sampled (category, magnitude, horizon) rows.
         """
+        categories, magnitudes, horizons, parents = self._sample_chain(
+            _CATEGORY_INDEX[start_vector.category],
+            start_vector.magnitude,
+            start_vector.time_horizon,
+            max_orders
+        )
+
+        # Causal order of each node, derived from its parent
+        orders = [0]
+        for i in range(1, len(categories)):
+            orders.append(orders[parents[i]] + 1)
+
+        downstream = range(1, len(categories))
         chain = [start_vector]
-        current_vectors = [start_vector]
-
-        for order in range(1, max_orders):
-            next_order_vectors = []
-            for v in current_vectors:
-                rules = self.causal_rules.get(v.category, [])
-                for target_cat, prob, multiplier in rules:
-                    if random.random() < prob:
-                        # Create a new downstream vector
+        chain.extend(ImpactVector.bulk_create(
+            categories=[_CATEGORIES[categories[i]] for i in downstream],
+            magnitudes=[magnitudes[i] for i in downstream],
+            time_horizons=[horizons[i] for i in downstream],
+            uncertainty_bounds=[(magnitudes[i] * 0.7, magnitudes[i] * 1.3) for i in downstream],
+            causal_dependencies=[
+                [f"order_{orders[i] - 1}_{_CATEGORIES[categories[parents[i]]].value}"] for i in downstream
+            ]
+        ))
+
+        return chain
+
+    def _sample_chain(self, start_category: int, start_magnitude: float, start_horizon: float,
+                      max_orders: int) -> Tuple[List[int], List[float], List[float], List[int]]:
+        """
+        Numeric core of the causal graph traversal.
+        Returns parallel lists of (category id, magnitude, time horizon, parent index)
+        for every node in the sampled chain, starting with the root at index 0.
+        """
+        rand = self._rng.random
+        uniform = self._rng.uniform
+        offsets = self._rule_offsets
+        targets = self._rule_targets
+        probs = self._rule_probs
+        mults = self._rule_mults
+
+        categories = [start_category]
+        magnitudes = [start_magnitude]
+        horizons = [start_horizon]
+        parents = [-1]
+        level_start, level_end = 0, 1
+
+        for _ in range(1, max_orders):
+            for node in range(level_start, level_end):
+                src = categories[node]
+                for r in range(offsets[src], offsets[src + 1]):
+                    if rand() < probs[r]:
                         # Magnitude is derived from parent, with some noise and multiplier
-                        noise = random.uniform(0.8, 1.2)
-                        new_mag = v.magnitude * multiplier * noise
-                        
+                        categories.append(targets[r])
+                        magnitudes.append(magnitudes[node] * mults[r] * uniform(0.8, 1.2))
                         # Time horizon usually expands as we go deeper
-                        new_horizon = v.time_horizon * random.uniform(1.5, 3.0)
-                        
-                        downstream = ImpactVector(
-                            category=target_cat,
-                            magnitude=new_mag,
-                            time_horizon=new_horizon,
-                            uncertainty_bounds=(new_mag * 0.7, new_mag * 1.3),
-                            causal_dependencies=[f"order_{order-1}_{v.category.value}"]
-                        )
-                        next_order_vectors.append(downstream)
-            
-            if not next_order_vectors:
+                        horizons.append(horizons[node] * uniform(1.5, 3.0))
+                        parents.append(node)
+
+            if len(categories) == level_end:
                 break
-                
-            chain.extend(next_order_vectors)
-            current_vectors = next_order_vectors
+            level_start, level_end = level_end, len(categories)
 
-        return chain
+        return categories, magnitudes, horizons, parents
+
+    def _run_simulations(self, simulations: int, start_category: ImpactCategory, magnitude: float,
+                         bounds: Tuple[float, float], max_orders: int, shift: float = 0.0,
+                         rel_se_target: Optional[float] = None) -> Tuple[int, float, float]:
+        """
+        Runs a batch of independent Monte Carlo simulations over the total magnitude
+        of each sampled chain. Returns the number of simulations run, and the sum and
+        sum of squares of (total - shift), accumulated on the fly. Follows the same
+        rule tables as _simulate_chain but only accumulates magnitudes, without
+        allocating ImpactVectors or sampling time horizons.
+
+        The sample at `shift` itself (the representative chain) counts towards the
+        early-stop check, which runs every 16 samples once the relative standard
+        error of the mean drops below rel_se_target.
+        """
+        rand = self._rng.random
+        uniform = self._rng.uniform
+        offsets = self._rule_offsets
+        targets = self._rule_targets
+        probs = self._rule_probs
+        mults = self._rule_mults
+        start = _CATEGORY_INDEX[start_category]
+        low, high = bounds
+        sample_start = low < high
+
+        target_sq = rel_se_target * rel_se_target if rel_se_target else 0.0
+        delta_sum = 0.0
+        delta_sq_sum = 0.0
+        runs = 0
+        while runs < simulations:
+            # Sample the first-order magnitude from its uncertainty bounds
+            start_mag = uniform(low, high) if sample_start else magnitude
+            total = start_mag
+            current = [(start, start_mag)]
+
+            for _ in range(1, max_orders):
+                next_order = []
+                for src, mag in current:
+                    for r in range(offsets[src], offsets[src + 1]):
+                        if rand() < probs[r]:
+                            new_mag = mag * mults[r] * uniform(0.8, 1.2)
+                            next_order.append((targets[r], new_mag))
+                            total += new_mag
+
+                if not next_order:
+                    break
+
+                current = next_order
+
+            delta = total - shift
+            delta_sum += delta
+            delta_sq_sum += delta * delta
+            runs += 1
+
+            # Early stop: se^2 = var / n compared against (target * mean)^2
+            n = runs + 1
+            if target_sq and n % 16 == 0:
+                delta_mean = delta_sum / n
+                mean = shift + delta_mean
+                variance = delta_sq_sum / n - delta_mean * delta_mean
+                if variance <= target_sq * mean * mean * n:
+                    break
+
+        return runs, delta_sum, delta_sq_sum
 
     def update_causal_rule(self, source_category: ImpactCategory, target_category: ImpactCategory, 
                            probability_delta: float, multiplier_delta: float):
@@ -160,26 +321,33 @@ class ForecastingLayer:
         Updates the causal probability and multiplier for a specific transition.
         Used by the recalibration engine to adjust forecasting weights based on real-world data.
         """
-        if source_category not in self.causal_rules:
+        self.update_causal_rule_by_idx(
+            _CATEGORY_INDEX[source_category],
+            _CATEGORY_INDEX[target_category],
+            probability_delta,
+            multiplier_delta
+        )
+
+    def update_causal_rule_by_idx(self, source_idx: int, target_idx: int,
+                                  probability_delta: float, multiplier_delta: float):
+        """
+        Same as update_causal_rule, addressed by category ids into the flattened rule tables.
+        Only existing transitions are updated; unknown transitions are ignored.
+        """
+        rows = self._rule_index.get((source_idx, target_idx))
+        if not rows:
             return
+        targets = self._rule_targets
+        probs = self._rule_probs
+        mults = self._rule_mults
 
-        rules = self.causal_rules[source_category]
-        updated_rules = []
-        found = False
-
-        for target, prob, mult in rules:
-            if target == target_category:
-                # Apply deltas with clamping
-                new_prob = max(0.0, min(1.0, prob + probability_delta))
-                new_mult = max(0.1, mult + multiplier_delta) # Multiplier shouldn't be zero/negative
-                updated_rules.append((target, new_prob, new_mult))
-                found = True
-            else:
-                updated_rules.append((target, prob, mult))
-        
-        if not found and probability_delta > 0:
-            # If the transition didn't exist but we observed it (implied by positive delta), 
-            # we might want to add it. For now, we only update existing rules to stay safe.
-            pass
+        for r in rows:
+            # Apply deltas with clamping
+            probs[r] = max(0.0, min(1.0, probs[r] + probability_delta))
+            mults[r] = max(0.1, mults[r] + multiplier_delta) # Multiplier shouldn't be zero/negative
 
-        self.causal_rules[source_category] = updated_rules
+        # Rebuild the source's readable rules from its flattened rows
+        self._causal_rules[_CATEGORIES[source_idx]] = tuple(
+            (_CATEGORIES[targets[r]], probs[r], mults[r])
+            for r in range(self._rule_offsets[source_idx], self._rule_offsets[source_idx + 1])
+        )
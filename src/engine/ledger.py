@@ -1,9 +1,32 @@
-import uuid
 import time
-from typing import Dict, List, Any, Optional
-from src.models.ledger import CreditEntry, CreditProvenance, EntryType, AgentBalance
+from collections import defaultdict, deque
+from typing import Dict, List, Any, Optional, Tuple
+from src.models.ledger import CreditEntry, CreditProvenance, EntryType, AgentBalance, new_entry_id, RECENT_ENTRY_LIMIT, _MICRO
 from src.models.impact import ImpactVector, ImpactCategory, ContributionClaim, SurplusPool
 
+# Category strings interned once, avoiding enum descriptor access per entry
+_CAT_VAL: Dict[ImpactCategory, str] = {c: c.value for c in ImpactCategory}
+# Fixed category ordinals for per-agent balance rows
+_CAT_ORDINAL: Dict[ImpactCategory, int] = {c: i for i, c in enumerate(ImpactCategory)}
+_CAT_NAMES: Tuple[str, ...] = tuple(c.name for c in ImpactCategory)
+
+# Category lookup by value or name, in either case (e.g. "research", "RESEARCH")
+_CAT_BY_STR: Dict[str, ImpactCategory] = {
+    **{c.value: c for c in ImpactCategory},
+    **{c.value.upper(): c for c in ImpactCategory},
+    **{c.name: c for c in ImpactCategory},
+    **{c.name.lower(): c for c in ImpactCategory}
+}
+
+def _resolve_category(label: Any) -> Optional[ImpactCategory]:
+    """Resolves a category label given by value or name, case-insensitively."""
+    if not isinstance(label, str):
+        return None
+    category = _CAT_BY_STR.get(label)
+    if category is None:
+        category = _CAT_BY_STR.get(label.lower())
+    return category
+
 class ContextualizedLedgerEngine:
     """
     Implements a double-entry ledger where credits are tagged with origin 
@@ -15,7 +38,15 @@ class ContextualizedLedgerEngine:
         # All ledger entries in order
         self.entries: List[CreditEntry] = []
         # Index for faster balance calculation
-        self._agent_balances: Dict[str, Dict[str, float]] = {} # agent_id -> {category_name -> amount}
+        # agent_id -> micro-credits per category ordinal (None until the category is first touched)
+        self._agent_balances: Dict[str, List[Optional[int]]] = {}
+        # Most recent entries per agent, so balance queries don't scan the full ledger
+        self._agent_recent: Dict[str, deque] = defaultdict(lambda: deque(maxlen=RECENT_ENTRY_LIMIT))
+        # Running totals in micro-credits maintained on insert (per agent and ledger-wide net)
+        self._agent_totals: Dict[str, int] = defaultdict(int)
+        self._ledger_net: int = 0
+        # Entry lookup by id for provenance verification (first entry wins on duplicate ids)
+        self._entry_index: Dict[str, CreditEntry] = {}
         # System account for surplus issuance (tracks total credits minted)
         self.SYSTEM_ACCOUNT = "SYSTEM_SURPLUS_ISSUANCE"
 
@@ -28,13 +59,37 @@ class ContextualizedLedgerEngine:
         Each allocation to an agent is recorded as a credit, balanced by a system debit.
         """
         new_entry_ids = []
+        batch: List[CreditEntry] = []
         cluster_id = pool.cluster_id
-        allocations = negotiation_results.get("final_allocations", {})
+        # The parallel id/amount sequences are authoritative; the keyed mapping is
+        # only read from results that lack them
+        agent_ids = negotiation_results.get("agent_ids")
+        if agent_ids is not None:
+            allocations = zip(agent_ids, negotiation_results["allocations"])
+        else:
+            allocations = negotiation_results.get("final_allocations", {}).items()
         
         # Map claims for easy lookup to get impact vectors
         claim_map = {c.agent_id: c for c in claims}
+
+        # Dominant category of the pool, used when a claim names no primary category
+        pool_category = None
+        if pool.aggregated_vectors:
+            pool_category = _resolve_category(max(pool.aggregated_vectors, key=pool.aggregated_vectors.get))
+
+        # Fields shared by every credit in this batch, resolved once
+        common_impact = {
+            "time_horizon": pool.metadata.get("avg_time_horizon", 1.0),
+            "uncertainty_bounds": pool.confidence_interval
+        }
+        common_provenance = {
+            "surplus_event_id": cluster_id,
+            "negotiation_round": negotiation_results.get("rounds_to_convergence")
+        }
+        # One timestamp for the whole batch; both sides of a double entry always shared it
+        batch_timestamp = time.time()
         
-        for agent_id, amount in allocations.items():
+        for agent_id, amount in allocations:
             if amount <= 0:
                 continue
                 
@@ -45,131 +100,148 @@ class ContextualizedLedgerEngine:
             if claim and claim.task_ids:
                 category_val = claim.metadata.get("primary_category")
                 if category_val:
-                    if isinstance(category_val, str):
-                        try:
-                            # Try as value (e.g. "research")
-                            category = ImpactCategory(category_val.lower())
-                        except ValueError:
-                            try:
-                                # Try as name (e.g. "RESEARCH")
-                                category = ImpactCategory[category_val.upper()]
-                            except KeyError:
-                                pass
-                elif hasattr(pool, 'aggregated_vectors') and pool.aggregated_vectors:
+                    category = _resolve_category(category_val) or category
+                elif pool_category:
                     # Pick most relevant from pool if available
-                    category_name = max(pool.aggregated_vectors, key=pool.aggregated_vectors.get)
-                    try:
-                        category = ImpactCategory[category_name.upper()]
-                    except KeyError:
-                        try:
-                            category = ImpactCategory(category_name.lower())
-                        except ValueError:
-                            pass
+                    category = pool_category
 
             # Construct representative ImpactVector for the credit
             # This represents the "backing" of the credit
             credit_impact = ImpactVector(
+                **common_impact,
                 category=category,
                 magnitude=amount,
-                time_horizon=pool.metadata.get("avg_time_horizon", 1.0),
-                uncertainty_bounds=pool.confidence_interval,
                 causal_dependencies=claim.task_ids if claim else [],
                 domain_weights={"surplus_contribution": claim.marginal_impact_estimate if claim else 0.0}
             )
 
             provenance = CreditProvenance(
-                surplus_event_id=cluster_id,
+                **common_provenance,
                 contribution_claim_id=claim.agent_id if claim else None,
-                task_ids=claim.task_ids if claim else [],
-                negotiation_round=negotiation_results.get("rounds_to_convergence")
+                task_ids=claim.task_ids if claim else []
             )
 
             # 1. Credit the Agent
             agent_entry = CreditEntry(
-                entry_id=str(uuid.uuid4()),
+                entry_id=new_entry_id(),
                 agent_id=agent_id,
                 amount=amount,
                 entry_type=EntryType.CREDIT,
                 impact_vector=credit_impact,
                 domain_context=category,
                 provenance=provenance,
-                timestamp=time.time()
+                timestamp=batch_timestamp
             )
             
             # 2. Debit the System Account (Double Entry)
             system_entry = CreditEntry(
-                entry_id=str(uuid.uuid4()),
+                entry_id=new_entry_id(),
                 agent_id=self.SYSTEM_ACCOUNT,
                 amount=-amount,
                 entry_type=EntryType.DEBIT,
                 impact_vector=credit_impact,
                 domain_context=category,
                 provenance=provenance,
-                timestamp=time.time()
+                timestamp=batch_timestamp
             )
 
-            self._add_entry(agent_entry)
-            self._add_entry(system_entry)
+            batch.append(agent_entry)
+            batch.append(system_entry)
             
             new_entry_ids.append(agent_entry.entry_id)
+
+        self._add_entries_bulk(batch)
             
         return new_entry_ids
 
     def _add_entry(self, entry: CreditEntry):
         """Internal helper to append entry and update balance cache."""
-        self.entries.append(entry)
-        
-        agent_id = entry.agent_id
-        category = entry.domain_context.name
-        
-        if agent_id not in self._agent_balances:
-            self._agent_balances[agent_id] = {}
-            
-        current_cat_balance = self._agent_balances[agent_id].get(category, 0.0)
-        self._agent_balances[agent_id][category] = round(current_cat_balance + entry.amount, 6)
+        self._add_entries_bulk((entry,))
+
+    def _add_entries_bulk(self, entries: List[CreditEntry]):
+        """
+        Appends a batch of entries in one pass and updates all balance caches.
+        Used for double-entry writes so both sides land together.
+        """
+        self.entries.extend(entries)
+
+        entry_index = self._entry_index
+        agent_recent = self._agent_recent
+        agent_totals = self._agent_totals
+        agent_balances = self._agent_balances
+        cat_ordinals = _CAT_ORDINAL
+        empty_row = [None] * len(_CAT_NAMES)
+        net = 0
+
+        for entry in entries:
+            entry_index.setdefault(entry.entry_id, entry)
+
+            agent_id = entry.agent_id
+            amount = round(entry.amount * _MICRO)
+            agent_recent[agent_id].append(entry)
+            agent_totals[agent_id] += amount
+            net += amount
+            category = cat_ordinals[entry.domain_context]
+
+            cat_balances = agent_balances.get(agent_id)
+            if cat_balances is None:
+                cat_balances = agent_balances[agent_id] = empty_row.copy()
+
+            current = cat_balances[category]
+            cat_balances[category] = amount if current is None else current + amount
+
+        self._ledger_net += net
 
     def get_agent_balance(self, agent_id: str) -> AgentBalance:
         """
         Returns a detailed balance for an agent, preserving domain context.
         """
-        cat_balances = self._agent_balances.get(agent_id, {})
-        total = sum(cat_balances.values())
+        cat_balances = self._agent_balances.get(agent_id, ())
+        total = self._agent_totals.get(agent_id, 0)
         
-        recent = [e for e in self.entries if e.agent_id == agent_id][-10:]
+        recent = list(self._agent_recent.get(agent_id, ()))
         
         return AgentBalance(
             agent_id=agent_id,
-            total_balance=round(total, 6),
-            balances_by_category=cat_balances,
+            total_balance=total / _MICRO,
+            balances_by_category={
+                name: amount / _MICRO for name, amount in zip(_CAT_NAMES, cat_balances) if amount is not None
+            },
             recent_entries=recent
         )
 
+    def get_agent_total(self, agent_id: str) -> float:
+        """
+        Returns only the agent's total balance, without building an AgentBalance.
+        """
+        return self._agent_totals.get(agent_id, 0) / _MICRO
+
     def verify_provenance(self, entry_id: str) -> Optional[Dict[str, Any]]:
         """
         Trace a specific credit back to its origin surplus event.
         """
-        for entry in self.entries:
-            if entry.entry_id == entry_id:
-                return {
-                    "entry_id": entry.entry_id,
-                    "agent_id": entry.agent_id,
-                    "origin_surplus_id": entry.provenance.surplus_event_id,
-                    "impact_magnitude": entry.impact_vector.magnitude,
-                    "impact_category": entry.domain_context.value,
-                    "timestamp": entry.timestamp,
-                    "traceability_status": "verified"
-                }
-        return None
+        entry = self._entry_index.get(entry_id)
+        if entry is None:
+            return None
+        return {
+            "entry_id": entry.entry_id,
+            "agent_id": entry.agent_id,
+            "origin_surplus_id": entry.provenance.surplus_event_id,
+            "impact_magnitude": entry.impact_vector.magnitude,
+            "impact_category": _CAT_VAL[entry.domain_context],
+            "timestamp": entry.timestamp,
+            "traceability_status": "verified"
+        }
 
     def audit_ledger(self) -> Dict[str, Any]:
         """
         Verify the integrity of the double-entry system.
-        Total credits - Total debits should be zero.
+        Total credits - Total debits should be zero (exactly, in micro-credits).
         """
-        total_sum = sum(e.amount for e in self.entries)
+        net = self._ledger_net
         return {
             "entry_count": len(self.entries),
-            "net_balance": round(total_sum, 8),
-            "integrity_check": "passed" if abs(total_sum) < 1e-6 else "failed",
+            "net_balance": net / _MICRO,
+            "integrity_check": "passed" if net == 0 else "failed",
             "system_issuance": self.get_agent_balance(self.SYSTEM_ACCOUNT).total_balance
         }
@@ -1,10 +1,11 @@
 import time
 import math
-from typing import List, Dict, Any, Tuple
+import functools
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from src.models.impact import ContributionClaim, SurplusPool
 
-@dataclass
+@dataclass(slots=True)
 class NegotiationRound:
     """
     Metadata for a single round of the bargaining loop.
@@ -15,6 +16,174 @@ class NegotiationRound:
     allocation_variance: float
     timestamp: float = field(default_factory=lambda: time.time())
 
+@dataclass(slots=True)
+class NegotiationRoundSummary:
+    """
+    Lightweight per-round record kept in "summary" history mode (no per-agent allocations).
+    The deviation is None on rounds where the convergence check didn't need it;
+    the final round always carries it.
+    """
+    round_number: int
+    deviation_from_objective: Optional[float]
+    allocation_variance: float
+
+HISTORY_DETAIL_LEVELS = ("none", "summary", "full")
+
+def _calculate_variance(values: List[float]) -> float:
+    """Helper to calculate variance without external libraries."""
+    if not values:
+        return 0.0
+    n = len(values)
+    mean = math.fsum(values) / n
+    return math.fsum((x - mean) * (x - mean) for x in values) / n
+
+@functools.lru_cache(maxsize=256)
+def _compute_targets(claim_signature: Tuple[Tuple[float, bool], ...],
+                     total_surplus: float,
+                     fairness_weight: float) -> Tuple[float, ...]:
+    """
+    Objective target per claim, given (marginal_impact_estimate, has_tasks) pairs.
+    """
+    num_agents = len(claim_signature)
+
+    # 1. Define Optimization Objective Component: Marginal Contribution Alignment
+    # Filter: Agents with no tasks receive zero impact credit regardless of their claim
+    is_contributor = [contributes for _, contributes in claim_signature]
+    marginal_impacts = [
+        estimate if contributes else 0.0
+        for estimate, contributes in claim_signature
+    ]
+    sum_marginal = sum(marginal_impacts)
+    
+    if sum_marginal > 0:
+        scale = total_surplus / sum_marginal
+        marginal_targets = [m * scale for m in marginal_impacts]
+    else:
+        # Fallback to egalitarian if no marginal contribution can be measured
+        marginal_targets = [total_surplus / num_agents] * num_agents
+        
+    # 2. Define Optimization Objective Component: Fairness Constraints
+    # Only contributors are eligible for the fairness pool baseline
+    num_contributors = sum(is_contributor)
+    
+    if num_contributors > 0:
+        fairness_target = total_surplus / num_contributors
+    else:
+        fairness_target = total_surplus / num_agents # Fallback to all if somehow none have tasks
+        
+    # 3. Compute Composite Optimization Objective Target
+    # This is the "Equilibrium Point" the system gravitates towards
+    # Non-contributors are strictly zero
+    efficiency_weight = 1 - fairness_weight
+    fairness_share = fairness_weight * fairness_target
+    return tuple(
+        efficiency_weight * mt + fairness_share if contributes else 0.0
+        for mt, contributes in zip(marginal_targets, is_contributor)
+    )
+
+def _run_negotiation(initial_allocations: List[float],
+                     velocities: List[float],
+                     objective_targets: List[float],
+                     total_surplus: float,
+                     max_iterations: int,
+                     tolerance: float,
+                     keep_snapshots: bool = False,
+                     record_deviations: bool = True,
+                     lazy_deviations: bool = False) -> Tuple[List[float], bool, List[Tuple[float, List[float]]], List[float], List[Optional[float]]]:
+    """
+    Numeric core of the iterative bargaining loop, operating on plain float vectors.
+
+    Returns the final allocations, whether the loop converged, and per-round
+    variances and deviations from the objective. Per-round (timestamp, allocations)
+    snapshots are only collected when keep_snapshots is set, and deviations only when
+    record_deviations is set. With lazy_deviations, a round's deviation is only
+    computed when the convergence check needs it (None otherwise), plus the final round.
+    """
+    num_agents = len(initial_allocations)
+    current_allocations = initial_allocations
+    snapshots: List[Tuple[float, List[float]]] = []
+    variances: List[float] = []
+    deviations: List[float] = []
+    prev_variance = _calculate_variance(current_allocations)
+    converged = False
+
+    # The update current + v * (target - current) is rewritten as keep * current + pull,
+    # with keep = 1 - v and pull = v * target fixed for the whole negotiation
+    keeps = [1.0 - velocity for velocity in velocities]
+    pulls = [velocity * target for velocity, target in zip(velocities, objective_targets)]
+
+    for iteration in range(max_iterations):
+        # Update step: every agent moves towards its target at its own velocity
+        new_allocations = [
+            keep * current + pull
+            for keep, current, pull in zip(keeps, current_allocations, pulls)
+        ]
+
+        # Global Normalization (Closed System Constraint)
+        # Ensures total allocated always equals total pool surplus
+        sum_new = sum(new_allocations)
+        if sum_new > 0:
+            scale = total_surplus / sum_new
+            current_allocations = [val * scale for val in new_allocations]
+        else:
+            current_allocations = [total_surplus / num_agents] * num_agents
+
+        # Round Metrics
+        current_variance = _calculate_variance(current_allocations)
+        variance_stable = abs(current_variance - prev_variance) < tolerance
+        if keep_snapshots:
+            snapshots.append((time.time(), current_allocations))
+        variances.append(current_variance)
+
+        # Deviation is only needed when variance alone doesn't settle convergence,
+        # or when every round's value is recorded for the history
+        deviation = None
+        if (record_deviations and not lazy_deviations) or (iteration > 0 and not variance_stable):
+            deviation = sum(abs(current - target) for current, target in zip(current_allocations, objective_targets))
+        if record_deviations:
+            deviations.append(deviation)
+
+        # Convergence Check (Stabilization of variance or reaching target)
+        if iteration > 0 and (variance_stable or deviation < tolerance):
+            converged = True
+            break
+
+        prev_variance = current_variance
+
+    if deviations and deviations[-1] is None:
+        deviations[-1] = sum(abs(current - target) for current, target in zip(current_allocations, objective_targets))
+
+    return current_allocations, converged, snapshots, variances, deviations
+
+def as_mapping(result: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Keyed view (agent_id -> allocation) of a negotiation result.
+    Built from the "agent_ids" and "allocations" sequences unless the result
+    already carries "final_allocations".
+    """
+    if "final_allocations" in result:
+        return result["final_allocations"]
+    return dict(zip(result["agent_ids"], result["allocations"]))
+
+def round_negotiation_result(result: Dict[str, Any], precision: int = 4) -> Dict[str, Any]:
+    """
+    Returns a copy of a negotiation result with allocations, targets and deviation
+    rounded for display. The engine itself reports full precision.
+    The display copy always carries the keyed "final_allocations".
+    """
+    display = dict(result)
+    if "final_allocations" in result:
+        display["final_allocations"] = {agent_id: round(value, precision) for agent_id, value in result["final_allocations"].items()}
+    elif "agent_ids" in result:
+        display["final_allocations"] = {agent_id: round(value, precision) for agent_id, value in zip(result["agent_ids"], result["allocations"])}
+    if "allocations" in result:
+        display["allocations"] = [round(value, precision) for value in result["allocations"]]
+    if "objective_targets" in result:
+        display["objective_targets"] = {agent_id: round(value, precision) for agent_id, value in result["objective_targets"].items()}
+    if "final_deviation" in result:
+        display["final_deviation"] = round(result["final_deviation"], precision)
+    return display
+
 class AutonomousNegotiationEngine:
     """
     Implements the autonomous cooperative negotiation protocol (Step Seven).
@@ -26,156 +195,143 @@ class AutonomousNegotiationEngine:
     def __init__(self, 
                  max_iterations: int = 50, 
                  equilibrium_tolerance: float = 1e-6, 
-                 fairness_weight: float = 0.3):
+                 fairness_weight: float = 0.3,
+                 history_detail: str = "summary"):
         """
         Initialize the negotiation engine.
         
         :param max_iterations: Maximum number of rounds in the bargaining loop.
         :param equilibrium_tolerance: Convergence threshold for allocation variance.
         :param fairness_weight: Weight assigned to fairness/egalitarian constraints (0.0 to 1.0).
+        :param history_detail: Round history to keep: "none", "summary" (round metrics only)
+                               or "full" (per-agent allocations for every round).
         """
+        if history_detail not in HISTORY_DETAIL_LEVELS:
+            raise ValueError(f"Invalid history detail: {history_detail}")
         self.max_iterations = max_iterations
         self.equilibrium_tolerance = equilibrium_tolerance
         self.fairness_weight = fairness_weight
+        self.history_detail = history_detail
 
-    def _calculate_variance(self, values: List[float]) -> float:
-        """Helper to calculate variance without external libraries."""
-        if not values:
-            return 0.0
-        n = len(values)
-        mean = sum(values) / n
-        return sum((x - mean) ** 2 for x in values) / n
-
-    def negotiate_splits(self, pool: SurplusPool, claims: List[ContributionClaim]) -> Dict[str, Any]:
+    def negotiate_splits(self, pool: SurplusPool, claims: List[ContributionClaim],
+                         include_targets: bool = False,
+                         keyed_allocations: bool = True) -> Dict[str, Any]:
         """
         Runs the iterative cooperative bargaining loop to reach an allocation consensus.
         
         The objective function J minimizes deviation from a target that balances
         marginal contribution (efficiency) and equal distribution (fairness).
         Convergence is reached when the variance of the allocations stabilizes.
+
+        The parallel "agent_ids" and "allocations" sequences are the authoritative
+        outcome. "final_allocations" is a keyed copy of the same values.
+
+        :param include_targets: Also return the per-agent objective targets.
+        :param keyed_allocations: Also build the keyed "final_allocations" mapping.
+                                  Without it, use as_mapping(result) where keyed access is needed.
         """
         if not claims or pool.total_surplus <= 0:
-            return {
+            result = {
                 "cluster_id": pool.cluster_id,
                 "total_surplus": pool.total_surplus,
-                "final_allocations": {},
+                "agent_ids": (),
+                "allocations": [],
                 "rounds_to_convergence": 0,
                 "converged": True,
                 "history": []
             }
+            if keyed_allocations:
+                result["final_allocations"] = {}
+            return result
 
-        num_agents = len(claims)
         total_surplus = pool.total_surplus
         agent_ids = [c.agent_id for c in claims]
         
-        # 1. Define Optimization Objective Component: Marginal Contribution Alignment
-        # Filter: Agents with no tasks receive zero impact credit regardless of their claim
-        marginal_impacts = [
-            c.marginal_impact_estimate if len(c.task_ids) > 0 else 0.0 
-            for c in claims
-        ]
-        sum_marginal = sum(marginal_impacts)
+        # Objective targets only depend on each claim's estimate and task presence,
+        # so repeated negotiations over the same claims reuse the cached result
+        is_contributor = [len(c.task_ids) > 0 for c in claims]
+        num_contributors = sum(is_contributor)
+        claim_signature = tuple(
+            (c.marginal_impact_estimate, contributes) for c, contributes in zip(claims, is_contributor)
+        )
+        objective_targets = _compute_targets(claim_signature, total_surplus, self.fairness_weight)
         
-        if sum_marginal > 0:
-            marginal_targets = [(m / sum_marginal) * total_surplus for m in marginal_impacts]
-        else:
-            # Fallback to egalitarian if no marginal contribution can be measured
-            marginal_targets = [total_surplus / num_agents] * num_agents
+        # Agents adjust their stance based on their ContributionClaim metadata.
+        # The resulting adjustment velocity only depends on the claim, so it is
+        # computed once up front rather than on every round.
+        base_velocity = 0.25
+        velocities = []
+        for claim in claims:
+            # Leverage Score: High dependency influence increases resistance to change
+            leverage = claim.dependency_influence_weight
             
-        # 2. Define Optimization Objective Component: Fairness Constraints
-        # Only contributors are eligible for the fairness pool baseline
-        contributor_indices = [i for i, c in enumerate(claims) if len(c.task_ids) > 0]
-        num_contributors = len(contributor_indices)
-        
-        if num_contributors > 0:
-            fairness_target = total_surplus / num_contributors
-        else:
-            fairness_target = total_surplus / num_agents # Fallback to all if somehow none have tasks
+            # Flex Score: Higher uncertainty makes an agent more willing to yield 
+            # to the collective objective
+            flexibility = min(1.0, claim.uncertainty_margin / (claim.marginal_impact_estimate + 1e-9))
             
-        # 3. Compute Composite Optimization Objective Target
-        # This is the "Equilibrium Point" the system gravitates towards
-        objective_targets = []
-        for i in range(num_agents):
-            if i in contributor_indices:
-                mt = marginal_targets[i]
-                target = (1 - self.fairness_weight) * mt + self.fairness_weight * fairness_target
-                objective_targets.append(target)
-            else:
-                # Strictly zero for non-contributors
-                objective_targets.append(0.0)
+            # Negotiated adjustment velocity
+            # (How fast the agent moves towards the collective objective target)
+            velocity = base_velocity * (1.0 + flexibility - 0.4 * leverage)
+            # Clamp to [0.05, 0.6] with comparisons rather than two builtin calls;
+            # the common in-range case takes a single chained test
+            velocities.append(velocity if 0.05 <= velocity <= 0.6 else (0.05 if velocity < 0.05 else 0.6))
         
         # Initial state: Start from a neutral uniform distribution among contributors
         # Non-contributors start at 0
         current_allocations = [
-            (total_surplus / num_contributors) if i in contributor_indices else 0.0
-            for i in range(num_agents)
+            (total_surplus / num_contributors) if contributes else 0.0
+            for contributes in is_contributor
         ]
         
-        history = []
-        prev_variance = self._calculate_variance(current_allocations)
-        converged = False
-        
         # 4. Iterative Bargaining Loop
-        for iteration in range(self.max_iterations):
-            new_allocations = []
-            
-            for i in range(num_agents):
-                claim = claims[i]
-                target = objective_targets[i]
-                current = current_allocations[i]
-                
-                # Agents adjust their stance based on their ContributionClaim metadata
-                
-                # Leverage Score: High dependency influence increases resistance to change
-                leverage = claim.dependency_influence_weight
-                
-                # Flex Score: Higher uncertainty makes an agent more willing to yield 
-                # to the collective objective
-                flexibility = min(1.0, claim.uncertainty_margin / (claim.marginal_impact_estimate + 1e-9))
-                
-                # Negotiated adjustment velocity
-                # (How fast the agent moves towards the collective objective target)
-                base_velocity = 0.25
-                velocity = base_velocity * (1.0 + flexibility - 0.4 * leverage)
-                velocity = max(0.05, min(0.6, velocity))
-                
-                # Update step
-                adjustment = velocity * (target - current)
-                new_allocations.append(current + adjustment)
-            
-            # 5. Global Normalization (Closed System Constraint)
-            # Ensures total allocated always equals total pool surplus
-            sum_new = sum(new_allocations)
-            if sum_new > 0:
-                current_allocations = [(val / sum_new) * total_surplus for val in new_allocations]
-            else:
-                current_allocations = [total_surplus / num_agents] * num_agents
-                
-            # Compute Round Metrics
-            current_variance = self._calculate_variance(current_allocations)
-            deviation = sum(abs(current_allocations[i] - objective_targets[i]) for i in range(num_agents))
-            
-            history.append(NegotiationRound(
-                round_number=iteration,
-                allocations={agent_ids[i]: round(current_allocations[i], 4) for i in range(num_agents)},
-                deviation_from_objective=round(deviation, 4),
-                allocation_variance=round(current_variance, 4)
-            ))
-            
-            # 6. Convergence Check (Stabilization of variance or reaching target)
-            if iteration > 0 and (abs(current_variance - prev_variance) < self.equilibrium_tolerance or deviation < self.equilibrium_tolerance):
-                converged = True
-                break
-                
-            prev_variance = current_variance
-
-        return {
+        history_detail = self.history_detail
+        current_allocations, converged, snapshots, variances, deviations = _run_negotiation(
+            current_allocations,
+            velocities,
+            objective_targets,
+            total_surplus,
+            self.max_iterations,
+            self.equilibrium_tolerance,
+            keep_snapshots=history_detail == "full",
+            record_deviations=history_detail != "none",
+            lazy_deviations=history_detail == "summary"
+        )
+        rounds = len(variances)
+
+        # 5. Round history, materialized once the loop is done
+        if history_detail == "full":
+            # Each round carries the stamp taken when the loop produced it
+            history = [
+                NegotiationRound(
+                    round_number=iteration,
+                    allocations=dict(zip(agent_ids, snapshot)),
+                    deviation_from_objective=deviation,
+                    allocation_variance=variance,
+                    timestamp=round_timestamp
+                )
+                for iteration, ((round_timestamp, snapshot), variance, deviation) in enumerate(zip(snapshots, variances, deviations))
+            ]
+        elif history_detail == "summary":
+            history = [
+                NegotiationRoundSummary(iteration, deviation, variance)
+                for iteration, (variance, deviation) in enumerate(zip(variances, deviations))
+            ]
+        else:
+            history = []
+
+        result = {
             "cluster_id": pool.cluster_id,
             "total_surplus": total_surplus,
-            "final_allocations": {agent_ids[i]: round(current_allocations[i], 4) for i in range(num_agents)},
-            "rounds_to_convergence": len(history),
+            "agent_ids": tuple(agent_ids),
+            "allocations": current_allocations,
+            "rounds_to_convergence": rounds,
             "converged": converged,
-            "final_deviation": round(sum(abs(current_allocations[i] - objective_targets[i]) for i in range(num_agents)), 4),
-            "history": history,
-            "objective_targets": {agent_ids[i]: round(objective_targets[i], 4) for i in range(num_agents)}
+            "final_deviation": sum(abs(current - target) for current, target in zip(current_allocations, objective_targets)),
+            "history": history
         }
+        if keyed_allocations:
+            result["final_allocations"] = dict(zip(agent_ids, current_allocations))
+        if include_targets:
+            result["objective_targets"] = dict(zip(agent_ids, objective_targets))
+
+        return result
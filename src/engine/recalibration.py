@@ -49,6 +49,19 @@ class ImpactRecalibrationEngine:
             "new_reliability": agent.performance.domain_reliability.get(domain, 0.5)
         }
 
+    def recalibrate_agent_performance_batch(self,
+                                            outcomes: List[Tuple[Agent, ImpactProjection, float]],
+                                            is_collaboration: bool = False) -> List[Dict[str, float]]:
+        """
+        Recalibrates agents for a batch of (agent, projection, actual_impact) outcomes.
+        Outcomes are applied in order, so repeated agents see each update in turn.
+        """
+        recalibrate = self.recalibrate_agent_performance
+        return [
+            recalibrate(agent, projection, actual_impact, is_collaboration)
+            for agent, projection, actual_impact in outcomes
+        ]
+
     def recalibrate_synergy_model(self, 
                                   surplus_pool: SurplusPool, 
                                   realized_surplus: float) -> Dict[str, float]:
@@ -92,9 +105,8 @@ class ImpactRecalibrationEngine:
             updates["synergy_multiplier_delta"] = synergy_delta * 0.5
 
             # Update specific structural pattern modifier
-            pattern_key_list = surplus_pool.metadata.get("pattern_key")
-            if pattern_key_list:
-                pattern_key = tuple(pattern_key_list)
+            pattern_key = surplus_pool.pattern_key
+            if pattern_key:
                 # Pattern evolution: faster learning for specific structures
                 pattern_delta = deviation_ratio * learning_rate * 2.0
                 self.surplus_engine.update_pattern_modifier(pattern_key, pattern_delta)
@@ -104,8 +116,7 @@ class ImpactRecalibrationEngine:
         # 2. Update Risk Factors (Dependency Risk)
         # If we overestimated surplus (realized < predicted), it might be due to 
         # underestimating the risk of external dependencies.
-        internal_deps = surplus_pool.metadata.get("internal_dependencies", 0)
-        external_deps = surplus_pool.metadata.get("external_dependencies", 0)
+        external_deps = surplus_pool.external_dependencies
         
         if external_deps > 0 and realized_surplus < predicted:
             # We fell short, and there were external dependencies. 
@@ -1,7 +1,8 @@
 import time
 import math
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from src.models.impact import ImpactProjection, ImpactVector, ImpactCategory, SurplusPool, ContributionClaim
+from src.models.impact_batch import ImpactVectorBatch
 
 class CooperativeSurplusEngine:
     """
@@ -27,18 +28,22 @@ class CooperativeSurplusEngine:
             roles.append(role)
         return tuple(sorted(roles))
 
-    def _compute_synergy_coefficient(self, projections: List[ImpactProjection], internal_deps: int) -> Tuple[float, Dict[str, float]]:
+    def _compute_synergy_coefficient(self, projections: List[ImpactProjection], internal_deps: int,
+                                     pattern_key: Optional[Tuple[str, ...]] = None) -> Tuple[float, Dict[str, float]]:
         """
         Implements non-linear synergy scaling based on cross-role diversity,
         dependency density, and contribution interdependence.
+        Pass the cluster's pattern_key when already known to avoid re-reading roles.
         """
         num_tasks = len(projections)
         if num_tasks <= 1:
             return 1.0, {"diversity": 1.0, "density": 0.0, "interdependence": 0.0}
 
+        if pattern_key is None:
+            pattern_key = self._get_pattern_key(projections)
+
         # 1. Cross-role diversity: unique roles involved
-        roles = {p.metadata.get("agent_role", "unknown") for p in projections}
-        diversity = len(roles) / num_tasks
+        diversity = len(set(pattern_key)) / num_tasks
 
         # 2. Dependency density: internal deps vs max possible
         max_possible_deps = num_tasks * (num_tasks - 1)
@@ -55,7 +60,6 @@ class CooperativeSurplusEngine:
         base_synergy = (diversity ** 0.4) * (1.0 + interdependence ** 1.2)
         
         # Apply pattern-specific modifier if it exists
-        pattern_key = self._get_pattern_key(projections)
         pattern_modifier = self.pattern_modifiers.get(pattern_key, 1.0)
         
         # Exponential boost from structural density
@@ -91,11 +95,15 @@ class CooperativeSurplusEngine:
         base_surplus = 0.0
         total_variance = 0.0
         
-        # Aggregated vectors by category
-        aggregated_magnitudes: Dict[str, float] = {}
+        # Aggregated vectors by category (first-order), summed column-wise in one pass
+        aggregated_magnitudes = ImpactVectorBatch.from_vectors(
+            [proj.target_vector for proj in projections]
+        ).totals_by_category_name()
         
+        # Dependencies are classified against a set of the cluster's task ids
+        task_id_set = frozenset(task_ids)
         internal_dependencies = 0
-        external_dependencies = 0
+        total_dependencies = 0
 
         for proj in projections:
             base_surplus += proj.distribution_mean
@@ -103,22 +111,16 @@ class CooperativeSurplusEngine:
             # Combine variances (std^2)
             total_variance += proj.distribution_std ** 2
             
-            # Aggregate vectors (first-order)
-            cat_name = proj.target_vector.category.name
-            aggregated_magnitudes[cat_name] = aggregated_magnitudes.get(cat_name, 0.0) + proj.target_vector.magnitude
-            
             # Check dependencies
             deps = proj.target_vector.causal_dependencies
-            for dep in deps:
-                if dep in task_ids:
-                    internal_dependencies += 1
-                else:
-                    external_dependencies += 1
+            total_dependencies += len(deps)
+            internal_dependencies += sum(1 for dep in deps if dep in task_id_set)
 
+        external_dependencies = total_dependencies - internal_dependencies
         pattern_key = self._get_pattern_key(projections)
 
         # Calculate Synergy Coefficient
-        synergy_bonus, synergy_metrics = self._compute_synergy_coefficient(projections, internal_dependencies)
+        synergy_bonus, synergy_metrics = self._compute_synergy_coefficient(projections, internal_dependencies, pattern_key)
         
         # Risk: External dependencies (uncontrolled) decrease the predicted value
         risk_discount = 1.0 / (1.0 + (external_dependencies * self.dependency_risk_factor))
@@ -150,9 +152,23 @@ class CooperativeSurplusEngine:
                 "risk_discount": round(risk_discount, 4),
                 "effective_multiplier": round(scaling_factor, 4),
                 "pattern_key": list(pattern_key) # JSON serializable
-            }
+            },
+            pattern_key=pattern_key,
+            internal_dependencies=internal_dependencies,
+            external_dependencies=external_dependencies
         )
 
+    def calculate_cluster_surplus_batch(self, cluster_ids: List[str],
+                                        projections_per_cluster: List[List[ImpactProjection]]) -> List[SurplusPool]:
+        """
+        Calculates surplus pools for several clusters in one call, in input order.
+        Each pool matches a separate calculate_cluster_surplus call.
+        """
+        if len(cluster_ids) != len(projections_per_cluster):
+            raise ValueError("Each cluster id needs exactly one list of projections.")
+        calculate = self.calculate_cluster_surplus
+        return [calculate(cluster_id, projections) for cluster_id, projections in zip(cluster_ids, projections_per_cluster)]
+
     def estimate_marginal_contributions(self, cluster_id: str, projections: List[ImpactProjection]) -> List[ContributionClaim]:
         """
         Computes predicted marginal contribution for each participating agent
@@ -175,10 +191,13 @@ class CooperativeSurplusEngine:
                 agent_projections[agent_id] = []
             agent_projections[agent_id].append(proj)
 
+        # Owner of each projection, read once for all counterfactual filters
+        owners = [p.metadata.get("agent_id") for p in projections]
+
         claims = []
         for agent_id, a_projs in agent_projections.items():
             # Counterfactual: Surplus WITHOUT this agent's involvement
-            remaining_projections = [p for p in projections if p.metadata.get("agent_id") != agent_id]
+            remaining_projections = [p for p, owner in zip(projections, owners) if owner != agent_id]
             
             if not remaining_projections:
                 # If this was the only agent, their marginal contribution is the total surplus
@@ -1,6 +1,13 @@
+import functools
+from collections import ChainMap
 from typing import List, Dict, Any
 from src.models.impact import ImpactProjection
-from src.models.agent import Agent
+from src.models.agent import Agent, get_trust_scores
+
+@functools.lru_cache(maxsize=4096)
+def _adjusted_mean(distribution_mean: float, trust_score: float, base_multiplier: float) -> float:
+    """Trust-weighted mean of a projection, rounded as reported."""
+    return round(distribution_mean * (trust_score * base_multiplier), 4)
 
 class ValuationEngine:
     """
@@ -23,7 +30,7 @@ class ValuationEngine:
         weight = trust_score * self.base_multiplier
         
         # Adjust distribution parameters
-        adjusted_mean = round(projection.distribution_mean * weight, 4)
+        adjusted_mean = _adjusted_mean(projection.distribution_mean, trust_score, self.base_multiplier)
         
         # Uncertainty might increase if trust is low
         uncertainty_expansion = 1.0 + (1.0 - trust_score)
@@ -41,14 +48,15 @@ class ValuationEngine:
             distribution_std=adjusted_std,
             confidence_interval=(ci_low, ci_high),
             effect_chain=projection.effect_chain,
-            metadata={
-                **projection.metadata,
+            # Adjustment fields layered over the original metadata instead of copying it;
+            # writes land in the overlay and leave the source projection untouched
+            metadata=ChainMap({
                 "agent_id": agent.id,
                 "agent_role": agent.role_label,
                 "trust_score": trust_score,
                 "adjustment_weight": weight,
                 "original_mean": projection.distribution_mean
-            }
+            }, projection.metadata)
         )
         
         return adjusted_projection
@@ -57,10 +65,13 @@ class ValuationEngine:
         """
         Ranks agents based on their potential weighted impact for a specific projection.
         """
-        rankings = []
-        for agent in agents:
-            adjusted = self.adjust_projection(projection, agent)
-            rankings.append((agent, adjusted.distribution_mean))
-        
-        # Sort by adjusted mean impact descending
-        return sorted(rankings, key=lambda x: x[1], reverse=True)
+        # Only the adjusted mean matters for ranking, so no adjusted projection is built
+        domain = projection.metadata.get("domain", "general")
+        mean = projection.distribution_mean
+        multiplier = self.base_multiplier
+        trust_scores = get_trust_scores([agent.performance for agent in agents], domain)
+        adjusted = [_adjusted_mean(mean, trust, multiplier) for trust in trust_scores]
+
+        # Sort by adjusted mean impact descending (stable for equal impact)
+        order = sorted(range(len(agents)), key=adjusted.__getitem__, reverse=True)
+        return [(agents[i], adjusted[i]) for i in order]
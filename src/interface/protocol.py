@@ -10,7 +10,7 @@ from src.models.cooperative_fund import InvestmentEvaluation
 from src.engine.forecasting import ForecastingLayer
 from src.engine.valuation import ValuationEngine
 from src.engine.surplus import CooperativeSurplusEngine
-from src.engine.negotiation import AutonomousNegotiationEngine
+from src.engine.negotiation import AutonomousNegotiationEngine, round_negotiation_result
 from src.engine.ledger import ContextualizedLedgerEngine
 from src.engine.cooperation import CooperativeInvestingEngine
 from src.engine.recalibration import ImpactRecalibrationEngine
@@ -42,6 +42,9 @@ class EconomyProtocol:
         self.tasks: Dict[str, Task] = {}
         self.projections: Dict[str, ImpactProjection] = {}
         self.agents: Dict[str, Agent] = {}
+        # Agents in registration order with their roster positions, for batch ranking
+        self._agent_roster: List[Agent] = []
+        self._agent_index: Dict[str, int] = {}
         self.surplus_pools: Dict[str, SurplusPool] = {}
         self.negotiation_results: Dict[str, Any] = {}
 
@@ -61,6 +64,19 @@ class EconomyProtocol:
         
         return task.id
 
+    def submit_tasks_batch(self, task_data_list: List[Dict[str, Any]]) -> List[str]:
+        """
+        Submits several tasks at once. All tasks are parsed (and validated) before
+        any is projected or stored. Returns the Task IDs in input order.
+        """
+        tasks = [Task.from_dict(task_data) for task_data in task_data_list]
+        projections = self.forecasting.project_batch(tasks)
+
+        self.tasks.update((task.id, task) for task in tasks)
+        self.projections.update((task.id, projection) for task, projection in zip(tasks, projections))
+
+        return [task.id for task in tasks]
+
     def get_projection(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Retrieves the raw impact projection for a task."""
         proj = self.projections.get(task_id)
@@ -80,7 +96,10 @@ class EconomyProtocol:
     def register_agent(self, agent_id: str, role: str) -> str:
         """Registers an agent or updates its role."""
         if agent_id not in self.agents:
-            self.agents[agent_id] = Agent.create(agent_id, role)
+            agent = Agent.create(agent_id, role)
+            self.agents[agent_id] = agent
+            self._agent_index[agent_id] = len(self._agent_roster)
+            self._agent_roster.append(agent)
         else:
             self.agents[agent_id].role_label = role
         return agent_id
@@ -106,6 +125,31 @@ class EconomyProtocol:
             "confidence_interval": adjusted_proj.confidence_interval
         }
 
+    def get_valuations_batch(self, pairs: List[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Retrieves valuations for several (task_id, agent_id) pairs in one call.
+        Results are in input order, None where the task or agent is unknown.
+        """
+        get_valuation = self.get_valuation
+        return [get_valuation(task_id, agent_id) for task_id, agent_id in pairs]
+
+    def rank_agents_for_task(self, task_id: str, agent_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Ranks registered agents (or the given subset) by trust-adjusted impact on a task.
+        """
+        projection = self.projections.get(task_id)
+        if not projection:
+            return []
+
+        if agent_ids is None:
+            candidates = self._agent_roster
+        else:
+            index = self._agent_index
+            candidates = [self._agent_roster[index[a]] for a in agent_ids if a in index]
+
+        rankings = self.valuation.rank_agents_for_task(projection, candidates)
+        return [{"agent_id": agent.id, "adjusted_mean": adjusted_mean} for agent, adjusted_mean in rankings]
+
     # --- Surplus & Negotiation ---
 
     def compute_cooperative_surplus(self, cluster_id: str, task_ids: List[str]) -> Dict[str, Any]:
@@ -127,32 +171,37 @@ class EconomyProtocol:
             "metadata": pool.metadata
         }
 
-    def run_negotiation(self, cluster_id: str, claims_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def run_negotiation(self, cluster_id: str, claims_data: List[Dict[str, Any]],
+                        include_targets: bool = False) -> Dict[str, Any]:
         """
         Orchestrates a negotiation session for a surplus pool.
         claims_data should contain: {"agent_id": str, "marginal_contribution": float, ...}
+        Set include_targets to also return each agent's objective target.
         """
         pool = self.surplus_pools.get(cluster_id)
         if not pool:
             return {"error": "Surplus pool not found"}
 
         # Convert dicts to ContributionClaim objects
-        claims = []
-        for c in claims_data:
-            claim = ContributionClaim(
+        claims = [
+            ContributionClaim(
                 agent_id=c["agent_id"],
+                cluster_id=cluster_id,
                 task_ids=c.get("task_ids", []),
                 marginal_impact_estimate=c.get("marginal_contribution", 0.0),
                 uncertainty_margin=c.get("uncertainty", 0.1),
                 dependency_influence_weight=c.get("dependency_weight", 0.0),
                 metadata=c.get("metadata", {})
             )
-            claims.append(claim)
+            for c in claims_data
+        ]
 
-        result = self.negotiation.negotiate_splits(pool, claims)
+        # The ledger reads the id/allocation sequences and the display copy builds
+        # its own rounded mapping, so the full-precision keyed one is skipped
+        result = self.negotiation.negotiate_splits(pool, claims, include_targets, keyed_allocations=False)
         self.negotiation_results[cluster_id] = (result, claims) # Store both for ledger recording
         
-        return result
+        return round_negotiation_result(result)
 
     # --- Ledger Operations ---
 
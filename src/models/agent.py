@@ -1,13 +1,74 @@
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 import math
 
-@dataclass
+def _trust_score(prediction_accuracy: float, impact_deviation: float, base_reliability: float) -> float:
+    # Weighted average of metrics
+    # Accuracy and domain reliability are positive, deviation is negative
+    score = (
+        prediction_accuracy * 0.3 +
+        (1.0 - min(impact_deviation, 1.0)) * 0.3 +
+        base_reliability * 0.4
+    )
+    return round(score, 4)
+
+def _trust_score_sigmoid(prediction_accuracy: float, impact_deviation: float, base_reliability: float,
+                         weights: Tuple[float, float, float] = (0.3, 0.3, 0.4), bias: float = 0.0) -> float:
+    # Logistic gate over the same features as the linear score; bounded in (0, 1)
+    deviation = 0.0 if impact_deviation < 0.0 else (1.0 if impact_deviation > 1.0 else impact_deviation)
+    z = (
+        weights[0] * prediction_accuracy +
+        weights[1] * (1.0 - deviation) +
+        weights[2] * base_reliability +
+        bias
+    )
+    # Numerically stable logistic for either sign of z
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+def _performance_step(accuracy: float, impact_deviation: float, collaboration_density: float,
+                      reliability: float, predicted_impact: float, actual_impact: float,
+                      is_collaboration: bool, alpha: float = 0.2) -> Tuple[float, float, float, float]:
+    """
+    One smoothing step for a completed task outcome. Returns the new
+    (prediction_accuracy, impact_deviation, collaboration_density, domain_reliability).
+    """
+    # Calculate deviation for this task
+    deviation = abs(actual_impact - predicted_impact) / predicted_impact if predicted_impact > 0 else 0.0
+
+    keep = 1 - alpha
+    # Moving average for impact deviation (simple smoothing)
+    impact_deviation = keep * impact_deviation + alpha * deviation
+
+    # Collaboration density
+    collaboration_density = keep * collaboration_density + alpha * (1.0 if is_collaboration else 0.0)
+
+    # Domain reliability: success is defined as staying within a reasonable deviation
+    # (1.0 - min(deviation, 1.0) written as a conditional, without the builtin call)
+    success = 1.0 if deviation < 0.2 else (0.0 if deviation >= 1.0 else 1.0 - deviation)
+    reliability = keep * reliability + alpha * success
+
+    # Prediction accuracy (how well they predicted their own success if applicable)
+    # For now, we use a simple heuristic: high success increases accuracy
+    accuracy = keep * accuracy + alpha * (1.0 if deviation < 0.1 else 0.5)
+
+    return accuracy, impact_deviation, collaboration_density, reliability
+
+@dataclass(slots=True)
 class PerformanceSignature:
     """
     Accumulated performance metadata for an agent.
     Used to generate embeddings for dynamic valuation weighting.
     """
+    # Trust scores per domain, cleared by the mutators below
+    _trust_cache: Dict[str, float] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Last generated embedding, dropped together with the trust scores
+    _embedding_cache: Optional[Tuple[float, ...]] = field(default=None, init=False, repr=False, compare=False)
+    # Scalar metrics the caches were built from, so a direct reassignment is noticed on the next read
+    _cache_state: Optional[Tuple[float, float, float, int]] = field(default=None, init=False, repr=False, compare=False)
     agent_id: str
     # Accuracy of the agent's own internal predictions (0.0 to 1.0)
     prediction_accuracy: float = 0.8
@@ -15,71 +76,150 @@ class PerformanceSignature:
     impact_deviation: float = 0.1
     # Ratio of collaborative tasks to total tasks
     collaboration_density: float = 0.5
-    # Domain-specific reliability scores (domain -> score 0.0 to 1.0)
-    domain_reliability: Dict[str, float] = field(default_factory=dict)
+    # Domain-specific reliability scores (domain -> score 0.0 to 1.0).
+    # Read through domain_reliability; change through set_domain_reliability.
+    _domain_reliability: Dict[str, float] = field(default_factory=dict, init=False)
     # Total tasks completed
     task_count: int = 0
 
+    @property
+    def domain_reliability(self) -> Mapping[str, float]:
+        """
+        Read-only view of the per-domain reliability scores.
+        """
+        return MappingProxyType(self._domain_reliability)
+
+    @domain_reliability.setter
+    def domain_reliability(self, scores: Mapping[str, float]):
+        self._domain_reliability = dict(scores)
+        self._clear_caches()
+
+    def _clear_caches(self):
+        self._trust_cache.clear()
+        self._embedding_cache = None
+
+    def _current_trust_cache(self) -> Dict[str, float]:
+        # Drop both caches if a scalar metric was reassigned since they were filled
+        state = (self.prediction_accuracy, self.impact_deviation, self.collaboration_density, self.task_count)
+        if state != self._cache_state:
+            self._clear_caches()
+            self._cache_state = state
+        return self._trust_cache
+
     def get_trust_score(self, domain: str) -> float:
         """
         Calculates an empirical trust score based on the performance signature.
         """
-        base_reliability = self.domain_reliability.get(domain, 0.5)
-        # Weighted average of metrics
-        # Accuracy and domain reliability are positive, deviation is negative
-        score = (
-            self.prediction_accuracy * 0.3 +
-            (1.0 - min(self.impact_deviation, 1.0)) * 0.3 +
-            base_reliability * 0.4
-        )
-        return round(score, 4)
+        cache = self._current_trust_cache()
+        score = cache.get(domain)
+        if score is None:
+            score = cache[domain] = self._compute_trust_score(domain)
+        return score
+
+    def _compute_trust_score(self, domain: str) -> float:
+        return _trust_score(self.prediction_accuracy, self.impact_deviation, self._domain_reliability.get(domain, 0.5))
 
     def update_performance(self, predicted_impact: float, actual_impact: float, is_collaboration: bool, domain: str):
         """
         Updates the signature based on a completed task outcome.
         """
-        # Calculate deviation for this task
-        if predicted_impact > 0:
-            deviation = abs(actual_impact - predicted_impact) / predicted_impact
-        else:
-            deviation = 0.0
-            
-        # Moving average for impact deviation (simple smoothing)
-        alpha = 0.2
-        self.impact_deviation = (1 - alpha) * self.impact_deviation + alpha * deviation
-        
-        # Update task count and collaboration density
+        (accuracy, impact_deviation, collaboration_density, reliability) = _performance_step(
+            self.prediction_accuracy,
+            self.impact_deviation,
+            self.collaboration_density,
+            self._domain_reliability.get(domain, 0.5),
+            predicted_impact,
+            actual_impact,
+            is_collaboration
+        )
+
+        self.impact_deviation = impact_deviation
         self.task_count += 1
-        collab_val = 1.0 if is_collaboration else 0.0
-        self.collaboration_density = (1 - alpha) * self.collaboration_density + alpha * collab_val
-        
-        # Update domain reliability
-        current_rel = self.domain_reliability.get(domain, 0.5)
-        # Success is defined as staying within a reasonable deviation
-        success = 1.0 if deviation < 0.2 else (1.0 - min(deviation, 1.0))
-        self.domain_reliability[domain] = (1 - alpha) * current_rel + alpha * success
-        
-        # Update prediction accuracy (how well they predicted their own success if applicable)
-        # For now, we use a simple heuristic: high success increases accuracy
-        self.prediction_accuracy = (1 - alpha) * self.prediction_accuracy + alpha * (1.0 if deviation < 0.1 else 0.5)
-
-    def generate_embedding(self) -> List[float]:
+        self.collaboration_density = collaboration_density
+        self.prediction_accuracy = accuracy
+        self._domain_reliability[domain] = reliability
+        self._clear_caches()
+
+    def set_domain_reliability(self, domain: str, reliability: float):
+        """
+        Sets the reliability score for one domain and invalidates the cached
+        trust scores and embedding.
+        """
+        self._domain_reliability[domain] = reliability
+        self._clear_caches()
 
+    def generate_embedding(self) -> Tuple[float, ...]:
         """
         Generates a vector representation of the agent's performance.
         Includes global metrics and an average of domain reliabilities.
+        The tuple is cached until the signature changes.
         """
-        avg_reliability = sum(self.domain_reliability.values()) / len(self.domain_reliability) if self.domain_reliability else 0.5
-        
-        return [
-            self.prediction_accuracy,
-            self.impact_deviation,
-            self.collaboration_density,
-            avg_reliability,
-            math.tanh(self.task_count / 100.0) # Normalized task volume
-        ]
+        self._current_trust_cache()
+        embedding = self._embedding_cache
+        if embedding is None:
+            reliabilities = self._domain_reliability
+            avg_reliability = sum(reliabilities.values()) / len(reliabilities) if reliabilities else 0.5
+            embedding = (
+                self.prediction_accuracy,
+                self.impact_deviation,
+                self.collaboration_density,
+                avg_reliability,
+                math.tanh(self.task_count / 100.0) # Normalized task volume
+            )
+            self._embedding_cache = embedding
+        return embedding
+
+def update_performance_batch(signatures: List[PerformanceSignature],
+                             predicted_impacts: List[float],
+                             actual_impacts: List[float],
+                             collaborations: List[bool],
+                             domains: List[str]):
+    """
+    Applies a batch of task outcomes, one per (signature, predicted, actual, collaboration, domain) row.
+    Rows are applied in order, so a signature appearing twice sees both updates.
+    """
+    for signature, predicted, actual, is_collaboration, domain in zip(
+            signatures, predicted_impacts, actual_impacts, collaborations, domains):
+        signature.update_performance(predicted, actual, is_collaboration, domain)
+
+def get_trust_scores(signatures: List[PerformanceSignature], domain: str) -> List[float]:
+    """
+    Trust scores for many signatures in one domain.
+    Cached scores are reused; the rest are computed in a single pass and cached.
+    """
+    scores = []
+    for signature in signatures:
+        cache = signature._current_trust_cache()
+        score = cache.get(domain)
+        if score is None:
+            score = cache[domain] = _trust_score(
+                signature.prediction_accuracy,
+                signature.impact_deviation,
+                signature._domain_reliability.get(domain, 0.5)
+            )
+        scores.append(score)
+    return scores
+
+def get_trust_scores_sigmoid(signatures: List[PerformanceSignature], domain: str,
+                             weights: Tuple[float, float, float] = (0.3, 0.3, 0.4),
+                             bias: float = 0.0) -> List[float]:
+    """
+    Sigmoid-gated trust scores for many signatures in one domain:
+    1 / (1 + exp(-(w . [accuracy, 1 - clip(deviation), reliability] + b))).
+    The linear get_trust_score remains the default used for valuation.
+    """
+    return [
+        _trust_score_sigmoid(
+            signature.prediction_accuracy,
+            signature.impact_deviation,
+            signature._domain_reliability.get(domain, 0.5),
+            weights,
+            bias
+        )
+        for signature in signatures
+    ]
 
-@dataclass
+@dataclass(slots=True)
 class Agent:
     """
     Represents an intelligent agent in the economic engine.
@@ -104,7 +244,7 @@ class Agent:
                 "prediction_accuracy": self.performance.prediction_accuracy,
                 "impact_deviation": self.performance.impact_deviation,
                 "collaboration_density": self.performance.collaboration_density,
-                "domain_reliability": self.performance.domain_reliability,
+                "domain_reliability": dict(self.performance.domain_reliability),
                 "task_count": self.performance.task_count
             }
         }
@@ -1,4 +1,5 @@
 import time
+import heapq
 from enum import Enum
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
@@ -10,13 +11,13 @@ class FundStatus(Enum):
     DEPLOYED = "deployed"
     COMPLETED = "completed"
 
-@dataclass
+@dataclass(slots=True)
 class FundContribution:
     agent_id: str
     amount: float
     timestamp: float = field(default_factory=lambda: time.time())
 
-@dataclass
+@dataclass(slots=True)
 class CooperativeFund:
     """
     A shared repository of credits tied to a specific future impact objective.
@@ -26,10 +27,41 @@ class CooperativeFund:
     status: FundStatus = FundStatus.OPEN
     contributions: List[FundContribution] = field(default_factory=list)
     deployed_task_cluster_id: Optional[str] = None
+    # Ledger identifiers derived from fund_id, formatted once at creation
+    account_id: str = field(init=False, repr=False)
+    investment_event_id: str = field(init=False, repr=False)
+    # Running sum of contribution amounts, maintained by add/remove_contribution
+    _total_pooled: float = field(init=False, repr=False, compare=False, default=0.0)
+
+    def __post_init__(self):
+        self.account_id = f"FUND_{self.fund_id}"
+        self.investment_event_id = f"COOP_FUND_INVESTMENT_{self.fund_id}"
+        self._rebuild_total()
+
+    def add_contribution(self, contribution: FundContribution):
+        """Records a contribution and updates the pooled total."""
+        self.contributions.append(contribution)
+        self._total_pooled += contribution.amount
+
+    def remove_contribution(self, contribution: FundContribution):
+        """Removes a previously recorded contribution and updates the pooled total."""
+        self.contributions.remove(contribution)
+        self._total_pooled -= contribution.amount
+
+    def _rebuild_total(self):
+        """Recomputes the pooled total from scratch, e.g. after constructing with existing contributions."""
+        self._total_pooled = sum(c.amount for c in self.contributions)
     
     @property
     def total_pooled(self) -> float:
-        return sum(c.amount for c in self.contributions)
+        return self._total_pooled
+
+    def top_contributions(self, k: int) -> List[FundContribution]:
+        """
+        The k largest contributions by amount, largest first.
+        Uses a bounded heap (O(n log k)) rather than sorting every contribution.
+        """
+        return heapq.nlargest(k, self.contributions, key=lambda c: c.amount)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -41,7 +73,7 @@ class CooperativeFund:
             "deployed_task_cluster_id": self.deployed_task_cluster_id
         }
 
-@dataclass
+@dataclass(slots=True)
 class InvestmentEvaluation:
     """
     Outcome of predictive risk modeling for a potential fund deployment.
@@ -1,6 +1,8 @@
 import time
+import math
+import weakref
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, MutableMapping, NamedTuple, Optional, Tuple, Any
 from dataclasses import dataclass, field
 
 class ImpactCategory(Enum):
@@ -11,10 +13,40 @@ class ImpactCategory(Enum):
     ECOSYSTEM = "ecosystem"
     TECHNICAL = "technical"
 
-@dataclass
+# All categories in ordinal order, built once per process
+IMPACT_CATEGORIES: Tuple[ImpactCategory, ...] = tuple(ImpactCategory)
+
+# Fixed ordinal per category, for list-indexed per-category tables
+IMPACT_CATEGORY_INDEX: Dict[ImpactCategory, int] = {c: i for i, c in enumerate(IMPACT_CATEGORIES)}
+
+class Bounds(NamedTuple):
+    """
+    A (low, high) interval. Being a tuple, it compares and serializes like the
+    plain pairs used elsewhere; deserialization builds these directly.
+    """
+    lo: float
+    hi: float
+
+def _validate_vector(magnitude: float, time_horizon: float, uncertainty_bounds: Tuple[float, float]):
+    """Field checks shared by ImpactVector construction paths."""
+    if math.isnan(magnitude) or math.isinf(magnitude) or magnitude <= 0:
+        raise ValueError(f"Invalid magnitude: {magnitude}")
+        
+    if time_horizon < 0:
+        raise ValueError(f"Negative time horizon: {time_horizon}")
+        
+    if any(math.isnan(b) or math.isinf(b) for b in uncertainty_bounds):
+        raise ValueError(f"Invalid uncertainty bounds: {uncertainty_bounds}")
+        
+    if uncertainty_bounds[0] > uncertainty_bounds[1]:
+        raise ValueError(f"Uncertainty bounds must be [min, max], got {uncertainty_bounds}")
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class ImpactVector:
     """
     A multi-dimensional representation of a task's downstream impact.
+    Fields can't be reassigned and vectors are hashable; vectors without container
+    contents can be shared between holders (see intern).
     """
     category: ImpactCategory
     # Magnitude projection (normalized or raw metric value)
@@ -34,18 +66,75 @@ class ImpactVector:
         """
         Validates the impact vector data to ensure robustness and fail-fast behavior.
         """
-        import math
-        if math.isnan(self.magnitude) or math.isinf(self.magnitude) or self.magnitude <= 0:
-            raise ValueError(f"Invalid magnitude: {self.magnitude}")
-            
-        if self.time_horizon < 0:
-            raise ValueError(f"Negative time horizon: {self.time_horizon}")
-            
-        if any(math.isnan(b) or math.isinf(b) for b in self.uncertainty_bounds):
-            raise ValueError(f"Invalid uncertainty bounds: {self.uncertainty_bounds}")
-            
-        if self.uncertainty_bounds[0] > self.uncertainty_bounds[1]:
-            raise ValueError(f"Uncertainty bounds must be [min, max], got {self.uncertainty_bounds}")
+        _validate_vector(self.magnitude, self.time_horizon, self.uncertainty_bounds)
+
+    @classmethod
+    def bulk_create(cls,
+                    categories: List[ImpactCategory],
+                    magnitudes: List[float],
+                    time_horizons: List[float],
+                    uncertainty_bounds: List[Tuple[float, float]],
+                    causal_dependencies: Optional[List[List[str]]] = None,
+                    domain_weights: Optional[List[Dict[str, float]]] = None,
+                    metrics: Optional[List[Dict[str, Any]]] = None) -> List["ImpactVector"]:
+        """
+        Builds many vectors from parallel columns.
+        All rows are validated up front (nothing is built if any row is invalid),
+        then instances are populated directly without a per-instance __post_init__.
+        Raises ValueError if the supplied columns differ in length.
+        """
+        count = len(categories)
+        columns = [magnitudes, time_horizons, uncertainty_bounds]
+        columns.extend(column for column in (causal_dependencies, domain_weights, metrics) if column is not None)
+        lengths = [len(column) for column in columns]
+        if any(length != count for length in lengths):
+            raise ValueError(f"Column lengths differ: expected {count} rows, got {lengths}")
+
+        for magnitude, time_horizon, bounds in zip(magnitudes, time_horizons, uncertainty_bounds):
+            _validate_vector(magnitude, time_horizon, bounds)
+
+        if causal_dependencies is None:
+            causal_dependencies = [[] for _ in range(count)]
+        if domain_weights is None:
+            domain_weights = [{} for _ in range(count)]
+        if metrics is None:
+            metrics = [{} for _ in range(count)]
+
+        new = object.__new__
+        set_field = object.__setattr__
+        vectors = []
+        for category, magnitude, time_horizon, bounds, dependencies, weights, vector_metrics in zip(
+                categories, magnitudes, time_horizons, uncertainty_bounds,
+                causal_dependencies, domain_weights, metrics):
+            vector = new(cls)
+            set_field(vector, "category", category)
+            set_field(vector, "magnitude", magnitude)
+            set_field(vector, "time_horizon", time_horizon)
+            set_field(vector, "uncertainty_bounds", bounds)
+            set_field(vector, "causal_dependencies", dependencies)
+            set_field(vector, "domain_weights", weights)
+            set_field(vector, "metrics", vector_metrics)
+            vectors.append(vector)
+        return vectors
+
+    @classmethod
+    def intern(cls, vector: "ImpactVector") -> "ImpactVector":
+        """
+        Returns the canonical instance for a vector's contents, registering it if new.
+        The list/dict fields stay mutable, so only vectors with all of them empty are
+        shared; any other vector is returned as-is.
+        """
+        if vector.causal_dependencies or vector.domain_weights or vector.metrics:
+            return vector
+        key = (vector.category, vector.magnitude, vector.time_horizon, tuple(vector.uncertainty_bounds))
+        canonical = _INTERN.get(key)
+        if canonical is None:
+            _INTERN[key] = canonical = vector
+        return canonical
+
+    def __hash__(self) -> int:
+        # Scalar fields only; equal vectors always agree on these
+        return hash((self.category, self.magnitude, self.time_horizon, tuple(self.uncertainty_bounds)))
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -58,7 +147,10 @@ class ImpactVector:
             "metrics": self.metrics
         }
 
-@dataclass
+# Canonical vectors by full contents; entries go away once no projection holds them
+_INTERN: "weakref.WeakValueDictionary[Tuple[Any, ...], ImpactVector]" = weakref.WeakValueDictionary()
+
+@dataclass(slots=True)
 class ImpactProjection:
     """
     The result of a forecasting pipeline, representing a probabilistic distribution
@@ -73,7 +165,8 @@ class ImpactProjection:
     effect_chain: List[ImpactVector] = field(default_factory=list)
     # Recursion/Recalibration metadata
     timestamp: float = field(default_factory=lambda: time.time())
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    # A plain dict, or a ChainMap overlay on adjusted projections (see ValuationEngine)
+    metadata: MutableMapping[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -84,47 +177,42 @@ class ImpactProjection:
             "confidence_interval": self.confidence_interval,
             "effect_chain": [v.to_dict() for v in self.effect_chain],
             "timestamp": self.timestamp,
-            "metadata": self.metadata
+            "metadata": dict(self.metadata)
         }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ImpactProjection":
-        target_vector_data = data["target_vector"]
-        target_vector = ImpactVector(
-            category=ImpactCategory(target_vector_data["category"]),
-            magnitude=target_vector_data["magnitude"],
-            time_horizon=target_vector_data["time_horizon"],
-            uncertainty_bounds=tuple(target_vector_data["uncertainty_bounds"]),
-            causal_dependencies=target_vector_data.get("causal_dependencies", []),
-            domain_weights=target_vector_data.get("domain_weights", {}),
-            metrics=target_vector_data.get("metrics", {})
-        )
-        
-        effect_chain = []
-        for v_data in data.get("effect_chain", []):
-            effect_chain.append(ImpactVector(
-                category=ImpactCategory(v_data["category"]),
-                magnitude=v_data["magnitude"],
-                time_horizon=v_data["time_horizon"],
-                uncertainty_bounds=tuple(v_data["uncertainty_bounds"]),
-                causal_dependencies=v_data.get("causal_dependencies", []),
-                domain_weights=v_data.get("domain_weights", {}),
-                metrics=v_data.get("metrics", {})
-            ))
+        # Target and chain rows are read in a single pass and built in one bulk call;
+        # the target is row 0, so it is still validated first
+        vector_data = [data["target_vector"], *data.get("effect_chain", [])]
+        rows = [
+            (
+                ImpactCategory(v_data["category"]),
+                v_data["magnitude"],
+                v_data["time_horizon"],
+                Bounds._make(v_data["uncertainty_bounds"]),
+                v_data.get("causal_dependencies", []),
+                v_data.get("domain_weights", {}),
+                v_data.get("metrics", {})
+            )
+            for v_data in vector_data
+        ]
+        target_vector, *effect_chain = ImpactVector.bulk_create(*zip(*rows))
 
         return cls(
             task_id=data["task_id"],
             target_vector=target_vector,
             distribution_mean=data["distribution_mean"],
             distribution_std=data["distribution_std"],
-            confidence_interval=tuple(data["confidence_interval"]),
+            confidence_interval=Bounds._make(data["confidence_interval"]),
             effect_chain=effect_chain,
-            timestamp=data.get("timestamp", time.time()),
+            # Stored stamp when present; the clock is only read as a fallback
+            timestamp=data["timestamp"] if "timestamp" in data else time.time(),
             metadata=data.get("metadata", {})
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class SurplusPool:
     """
     A shared pool of value derived from a task cluster's collective impact.
@@ -136,6 +224,10 @@ class SurplusPool:
     task_ids: List[str]
     timestamp: float = field(default_factory=lambda: time.time())
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Structural fields read on recalibration (also mirrored in metadata for reporting)
+    pattern_key: Optional[Tuple[str, ...]] = None
+    internal_dependencies: int = 0
+    external_dependencies: int = 0
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -149,7 +241,7 @@ class SurplusPool:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ContributionClaim:
     """
     A structured claim representing an agent's marginal contribution to a surplus pool.
@@ -0,0 +1,48 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+from src.models.impact import ImpactVector, ImpactCategory, IMPACT_CATEGORIES, IMPACT_CATEGORY_INDEX
+
+# Categories by ordinal; batches store IMPACT_CATEGORY_INDEX ordinals instead of enum members
+_CATEGORIES = IMPACT_CATEGORIES
+
+@dataclass(slots=True)
+class ImpactVectorBatch:
+    """
+    Column-oriented view of many ImpactVectors (one list per field),
+    used for cluster-level aggregation without per-vector dict updates.
+    """
+    category_ids: List[int] = field(default_factory=list)
+    magnitudes: List[float] = field(default_factory=list)
+    time_horizons: List[float] = field(default_factory=list)
+    uncertainty_low: List[float] = field(default_factory=list)
+    uncertainty_high: List[float] = field(default_factory=list)
+
+    @classmethod
+    def from_vectors(cls, vectors: List[ImpactVector]) -> "ImpactVectorBatch":
+        index = IMPACT_CATEGORY_INDEX
+        return cls(
+            category_ids=[index[v.category] for v in vectors],
+            magnitudes=[v.magnitude for v in vectors],
+            time_horizons=[v.time_horizon for v in vectors],
+            uncertainty_low=[v.uncertainty_bounds[0] for v in vectors],
+            uncertainty_high=[v.uncertainty_bounds[1] for v in vectors]
+        )
+
+    def __len__(self) -> int:
+        return len(self.category_ids)
+
+    def aggregate_by_category(self) -> List[float]:
+        """Total magnitude per category ordinal (one slot per ImpactCategory)."""
+        totals = [0.0] * len(_CATEGORIES)
+        for category_id, magnitude in zip(self.category_ids, self.magnitudes):
+            totals[category_id] += magnitude
+        return totals
+
+    def totals_by_category_name(self) -> Dict[str, float]:
+        """
+        Total magnitude keyed by category name, for categories present in the batch.
+        Keys follow first appearance, matching an incrementally built dict.
+        """
+        totals = self.aggregate_by_category()
+        order = dict.fromkeys(self.category_ids)
+        return {_CATEGORIES[category_id].name: totals[category_id] for category_id in order}
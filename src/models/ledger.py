@@ -1,14 +1,25 @@
+import os
 import time
 from enum import Enum
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 from src.models.impact import ImpactVector, ImpactCategory
 
+# Balances are kept as integer micro-credits (6 decimal places) and only
+# converted back to floats at the reporting boundary
+_MICRO = 1_000_000
+# Number of recent entries kept per agent balance
+RECENT_ENTRY_LIMIT = 10
+
+def new_entry_id() -> str:
+    """Returns a random 128-bit hex identifier for a ledger entry."""
+    return os.urandom(16).hex()
+
 class EntryType(Enum):
     CREDIT = "credit"
     DEBIT = "debit"
 
-@dataclass
+@dataclass(slots=True)
 class CreditProvenance:
     """
     Metadata linking a credit to the cooperative surplus event that generated it.
@@ -27,7 +38,7 @@ class CreditProvenance:
             "negotiation_round": self.negotiation_round
         }
 
-@dataclass
+@dataclass(slots=True)
 class CreditEntry:
     """
     A single entry in the contextualized ledger.
@@ -56,7 +67,7 @@ class CreditEntry:
             "metadata": self.metadata
         }
 
-@dataclass
+@dataclass(slots=True)
 class AgentBalance:
     """
     Represents the current state of an agent's credits,
@@ -67,6 +78,30 @@ class AgentBalance:
     balances_by_category: Dict[str, float]
     recent_entries: List[CreditEntry] = field(default_factory=list)
 
+    def apply_entry(self, entry: CreditEntry):
+        """
+        Brings the balance up to date with one new entry for this agent, so a held
+        balance can follow the ledger without being rebuilt. Sums are taken in
+        micro-credits, matching the ledger's own rounding.
+        """
+        amount = round(entry.amount * _MICRO)
+        self.total_balance = (round(self.total_balance * _MICRO) + amount) / _MICRO
+        category = entry.domain_context.name
+        current = self.balances_by_category.get(category)
+        self.balances_by_category[category] = amount / _MICRO if current is None else (round(current * _MICRO) + amount) / _MICRO
+        self.recent_entries.append(entry)
+        if len(self.recent_entries) > RECENT_ENTRY_LIMIT:
+            del self.recent_entries[0]
+
+    def snapshot(self) -> "AgentBalance":
+        """Copy that is unaffected by later apply_entry calls on this balance."""
+        return AgentBalance(
+            agent_id=self.agent_id,
+            total_balance=self.total_balance,
+            balances_by_category=dict(self.balances_by_category),
+            recent_entries=list(self.recent_entries)
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "agent_id": self.agent_id,
@@ -7,18 +7,46 @@ class ImpactMetricRegistry:
     This allows plugging in revenue, research, or social metrics without changing logic.
     """
     def __init__(self):
-        self._mappers: Dict[str, Callable[[Any], ImpactVector]] = {}
+        # Dispatch table: mappers by registration index, plus name -> index
+        self._mapper_list: List[Callable[[Any], ImpactVector]] = []
+        self._name_to_idx: Dict[str, int] = {}
 
     def register_metric(self, name: str, mapper: Callable[[Any], ImpactVector]):
         """
         Registers a mapper function that converts raw domain data into an ImpactVector.
+        Re-registering a name replaces its mapper in place.
         """
-        self._mappers[name] = mapper
+        if isinstance(self._mapper_list, tuple):
+            raise ValueError(f"Cannot register metric '{name}': registry is frozen.")
+        idx = self._name_to_idx.get(name)
+        if idx is None:
+            self._name_to_idx[name] = len(self._mapper_list)
+            self._mapper_list.append(mapper)
+        else:
+            self._mapper_list[idx] = mapper
+
+    def freeze(self):
+        """
+        Locks the registry once all metrics are registered; the dispatch table
+        becomes an immutable tuple and further registrations are rejected.
+        """
+        self._mapper_list = tuple(self._mapper_list)
+
+    def get_index(self, metric_name: str) -> int:
+        """Dispatch index for a metric, so tight loops can hoist the name lookup."""
+        idx = self._name_to_idx.get(metric_name, -1)
+        if idx < 0:
+            raise ValueError(f"Metric '{metric_name}' not registered.")
+        return idx
 
     def translate(self, metric_name: str, data: Any) -> ImpactVector:
-        if metric_name not in self._mappers:
+        idx = self._name_to_idx.get(metric_name, -1)
+        if idx < 0:
             raise ValueError(f"Metric '{metric_name}' not registered.")
-        return self._mappers[metric_name](data)
+        return self._mapper_list[idx](data)
+
+    def translate_by_idx(self, idx: int, data: Any) -> ImpactVector:
+        return self._mapper_list[idx](data)
 
 # Example Usage (Domain Agnostic Plug-ins)
 def revenue_mapper(data: Dict[str, Any]) -> ImpactVector:
@@ -0,0 +1,65 @@
+from typing import Dict, List, Any, Callable, Optional, Tuple
+from .impact import ImpactVector
+from .registry import ImpactMetricRegistry
+
+def _content_key(data: Any) -> Optional[Tuple[Tuple[str, type, Any], ...]]:
+    """
+    Hashable key for a metrics dict, or None when the data can't be keyed
+    (non-dict input or unhashable values such as dependency lists).
+    Value types are part of the key, so e.g. True and 1 are cached separately.
+    """
+    try:
+        key = tuple(sorted((name, type(value), value) for name, value in data.items()))
+        hash(key)
+    except (AttributeError, TypeError):
+        return None
+    return key
+
+class CachedRegistry(ImpactMetricRegistry):
+    """
+    Registry that memoizes translations by metric name and metric contents.
+    Repeated inputs (e.g. the same contract template across tasks) return the
+    previously built ImpactVector, which callers must treat as read-only.
+    """
+    def __init__(self, maxsize: int = 4096):
+        super().__init__()
+        self._cache: Dict[Tuple[str, Tuple[Tuple[str, type, Any], ...]], ImpactVector] = {}
+        self._maxsize = maxsize
+
+    def register_metric(self, name: str, mapper: Callable[[Any], ImpactVector]):
+        super().register_metric(name, mapper)
+        # A replaced mapper invalidates anything translated under its name
+        self._cache = {k: v for k, v in self._cache.items() if k[0] != name}
+
+    def translate(self, metric_name: str, data: Any) -> ImpactVector:
+        key = _content_key(data)
+        if key is None:
+            return super().translate(metric_name, data)
+
+        cache_key = (metric_name, key)
+        vector = self._cache.get(cache_key)
+        if vector is None:
+            vector = super().translate(metric_name, data)
+            if len(self._cache) >= self._maxsize:
+                # Evict the oldest entry (insertion order)
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[cache_key] = vector
+        return vector
+
+    def translate_batch(self, metric_name: str, data_list: List[Any]) -> List[ImpactVector]:
+        """
+        Translates many inputs for one metric, mapping each distinct input only once.
+        """
+        translate = self.translate
+        seen: Dict[Tuple[Tuple[str, type, Any], ...], ImpactVector] = {}
+        vectors = []
+        for data in data_list:
+            key = _content_key(data)
+            if key is None:
+                vectors.append(translate(metric_name, data))
+                continue
+            vector = seen.get(key)
+            if vector is None:
+                vector = seen[key] = translate(metric_name, data)
+            vectors.append(vector)
+        return vectors
@@ -0,0 +1,45 @@
+import json
+from typing import Dict, List, Any, Iterable
+from src.models.ledger import CreditEntry
+
+# Compact encoder reused across dumps
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+def _entry_rows(entries: Iterable[CreditEntry]) -> List[Dict[str, Any]]:
+    """
+    Plain-dict rows for a batch of entries. Impact vectors and provenance records
+    shared between entries (both sides of a double-entry write point at the same
+    objects) are converted once and reused.
+    """
+    vectors: Dict[int, Dict[str, Any]] = {}
+    provenances: Dict[int, Dict[str, Any]] = {}
+    rows = []
+    for entry in entries:
+        impact_vector = entry.impact_vector
+        vector_row = vectors.get(id(impact_vector))
+        if vector_row is None:
+            vector_row = vectors[id(impact_vector)] = impact_vector.to_dict()
+
+        provenance = entry.provenance
+        provenance_row = provenances.get(id(provenance))
+        if provenance_row is None:
+            provenance_row = provenances[id(provenance)] = provenance.to_dict()
+
+        rows.append({
+            "entry_id": entry.entry_id,
+            "agent_id": entry.agent_id,
+            "amount": entry.amount,
+            "entry_type": entry.entry_type.value,
+            "impact_vector": vector_row,
+            "domain_context": entry.domain_context.value,
+            "provenance": provenance_row,
+            "timestamp": entry.timestamp,
+            "metadata": entry.metadata
+        })
+    return rows
+
+def dump_entries(entries: Iterable[CreditEntry]) -> bytes:
+    """
+    Serializes ledger entries to compact UTF-8 JSON (a list of CreditEntry.to_dict rows).
+    """
+    return _ENCODER.encode(_entry_rows(entries)).encode("utf-8")
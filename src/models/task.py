@@ -1,7 +1,8 @@
+import math
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """
     Represents a task entering the system.
@@ -16,6 +17,10 @@ class Task:
             raise ValueError("Task ID cannot be empty.")
         if not self.domain:
             raise ValueError("Task domain cannot be empty.")
+        # Non-finite numeric metrics can't produce a valid projection; reject them here
+        for name, value in self.metrics.items():
+            if type(value) is float and not math.isfinite(value):
+                raise ValueError(f"Invalid metric '{name}': {value}")
 
     def to_dict(self) -> Dict[str, Any]:
         return {
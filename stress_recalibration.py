@@ -1,6 +1,7 @@
 import random
 import time
 import math
+import functools
 from typing import List, Dict, Any, Tuple
 
 from src.models.impact import ImpactVector, ImpactCategory, ImpactProjection, SurplusPool
@@ -11,15 +12,32 @@ from src.engine.forecasting import ForecastingLayer
 from src.engine.surplus import CooperativeSurplusEngine
 from src.engine.recalibration import ImpactRecalibrationEngine
 
-def run_volatility_stress_test(iterations: int = 50, black_swan_prob: float = 0.5):
-    print(f"--- Starting Volatility & Recalibration Drift Stress Test ---")
-    print(f"Iterations: {iterations}, Black Swan Probability: {black_swan_prob}")
-    
-    # 1. Setup
+@functools.lru_cache(maxsize=1)
+def _default_registry() -> ImpactMetricRegistry:
+    """Registry wiring shared across runs; frozen, since it is never modified after setup."""
     registry = ImpactMetricRegistry()
     registry.register_metric("technical", technical_mapper)
     registry.register_metric("research", research_mapper)
     registry.register_metric("revenue", revenue_mapper)
+    registry.freeze()
+    return registry
+
+def _render_log(log_rows: List[int], history: Dict[str, List[Any]]):
+    """Prints the periodic progress lines for the logged iterations in a single write."""
+    lines = [
+        f"Iteration {i}: Type={'SWAN' if history['is_black_swan'][i] else 'NORM'}, "
+        f"TrustA={history['trust_alpha'][i]}, Synergy={history['synergy_mult'][i]:.4f}"
+        for i in log_rows
+    ]
+    if lines:
+        print("\n".join(lines))
+
+def run_volatility_stress_test(iterations: int = 50, black_swan_prob: float = 0.5):
+    print(f"--- Starting Volatility & Recalibration Drift Stress Test ---")
+    print(f"Iterations: {iterations}, Black Swan Probability: {black_swan_prob}")
+    
+    # 1. Setup (engines are stateful and rebuilt per run; the registry is shared)
+    registry = _default_registry()
     
     forecasting_layer = ForecastingLayer(registry)
     surplus_engine = CooperativeSurplusEngine(synergy_multiplier=0.15)
@@ -31,14 +49,27 @@ def run_volatility_stress_test(iterations: int = 50, black_swan_prob: float = 0.
         Agent.create("agent_gamma", "architect")
     ]
     
-    # Track metrics over time
-    history = []
+    # Track metrics over time, one preallocated column per metric (rounded only when printed)
+    history_columns = ("predicted", "actual", "trust_alpha", "trust_beta", "trust_gamma", "synergy_mult", "risk_factor")
+    history = {name: [0.0] * iterations for name in history_columns}
+    history["agent"] = [None] * iterations
+    history["is_black_swan"] = [False] * iterations
+
+    # Draw the whole random stream up front: agent, domain, black swan flag,
+    # swan factor (10x up / 10x down) and normal variance per iteration
+    agent_draws = random.choices(agents, k=iterations)
+    domain_draws = random.choices(["technical", "research"], k=iterations)
+    swan_draws = [random.random() < black_swan_prob for _ in range(iterations)]
+    swan_factors = random.choices((10.0, 0.1), k=iterations)
+    normal_factors = [random.uniform(0.8, 1.2) for _ in range(iterations)]
+    
+    log_rows = []
     
     # 2. Simulation Loop
     for i in range(iterations):
         # Select an agent for this task
-        agent = random.choice(agents)
-        domain = random.choice(["technical", "research"])
+        agent = agent_draws[i]
+        domain = domain_draws[i]
         
         # Create a dummy task
         task = Task(
@@ -56,15 +87,14 @@ def run_volatility_stress_test(iterations: int = 50, black_swan_prob: float = 0.
         
         # Determine outcome
         predicted_mean = projection.distribution_mean
-        is_black_swan = random.random() < black_swan_prob
+        is_black_swan = swan_draws[i]
         
         if is_black_swan:
             # Black Swan event: 10x higher or 10x lower
-            factor = 10.0 if random.random() > 0.5 else 0.1
-            actual_impact = predicted_mean * factor
+            actual_impact = predicted_mean * swan_factors[i]
         else:
             # Normal variance: +/- 20%
-            actual_impact = predicted_mean * random.uniform(0.8, 1.2)
+            actual_impact = predicted_mean * normal_factors[i]
         
         # 3. Recalibrate
         # Recalibrate agent
@@ -99,23 +129,21 @@ def run_volatility_stress_test(iterations: int = 50, black_swan_prob: float = 0.
         )
         
         # Log state
-        current_state = {
-            "iteration": i,
-            "agent": agent.id,
-            "is_black_swan": is_black_swan,
-            "predicted": round(predicted_mean, 2),
-            "actual": round(actual_impact, 2),
-            "trust_alpha": agents[0].performance.get_trust_score("technical"),
-            "trust_beta": agents[1].performance.get_trust_score("research"),
-            "trust_gamma": agents[2].performance.get_trust_score("technical"),
-            "synergy_mult": round(surplus_engine.synergy_multiplier, 4),
-            "risk_factor": round(surplus_engine.dependency_risk_factor, 4)
-        }
-        history.append(current_state)
+        history["agent"][i] = agent.id
+        history["is_black_swan"][i] = is_black_swan
+        history["predicted"][i] = predicted_mean
+        history["actual"][i] = actual_impact
+        history["trust_alpha"][i] = agents[0].performance.get_trust_score("technical")
+        history["trust_beta"][i] = agents[1].performance.get_trust_score("research")
+        history["trust_gamma"][i] = agents[2].performance.get_trust_score("technical")
+        history["synergy_mult"][i] = surplus_engine.synergy_multiplier
+        history["risk_factor"][i] = surplus_engine.dependency_risk_factor
         
-        # Periodic printing
+        # Periodic progress rows, rendered once after the loop
         if i % 10 == 0:
-            print(f"Iteration {i}: Type={'SWAN' if is_black_swan else 'NORM'}, TrustA={current_state['trust_alpha']}, Synergy={current_state['synergy_mult']}")
+            log_rows.append(i)
+
+    _render_log(log_rows, history)
 
     # Final Assessment
     print(f"\n--- Final Results Summary ---")
@@ -124,11 +152,11 @@ def run_volatility_stress_test(iterations: int = 50, black_swan_prob: float = 0.
     for a in agents:
         t_tech = a.performance.get_trust_score("technical")
         t_res = a.performance.get_trust_score("research")
-        print(f"{a.id:<15} | {t_tech:<12} | {t_res:<12} | {round(a.performance.impact_deviation, 4):<8}")
+        print(f"{a.id:<15} | {t_tech:<12} | {t_res:<12} | {a.performance.impact_deviation:<8.4f}")
     
     print(f"\nGlobal Metrics:")
-    print(f"Synergy Multiplier: {round(surplus_engine.synergy_multiplier, 4)}")
-    print(f"Risk Factor:        {round(surplus_engine.dependency_risk_factor, 4)}")
+    print(f"Synergy Multiplier: {surplus_engine.synergy_multiplier:.4f}")
+    print(f"Risk Factor:        {surplus_engine.dependency_risk_factor:.4f}")
     
     # Success Criteria check
     print(f"\n--- Criteria Verification ---")
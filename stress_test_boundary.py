@@ -1,6 +1,7 @@
 import math
 import uuid
 import logging
+import functools
 from src.models.impact import ImpactVector, ImpactCategory, ImpactProjection, SurplusPool
 from src.models.task import Task
 from src.models.agent import Agent, PerformanceSignature
@@ -15,10 +16,18 @@ from src.engine.ledger import ContextualizedLedgerEngine
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger("BoundaryStressTest")
 
-def setup_test_environment():
+@functools.lru_cache(maxsize=1)
+def _default_registry() -> ImpactMetricRegistry:
+    """Registry wiring shared across setups; frozen, since it is never modified after setup."""
     registry = ImpactMetricRegistry()
     registry.register_metric("technical", technical_mapper)
     registry.register_metric("revenue", revenue_mapper)
+    registry.freeze()
+    return registry
+
+def setup_test_environment():
+    # Engines hold recalibration state, so every setup gets fresh ones
+    registry = _default_registry()
     
     forecaster = ForecastingLayer(registry)
     surplus_engine = CooperativeSurplusEngine()
@@ -2,8 +2,7 @@
 import time
 import random
 import sys
-import psutil
-import os
+import tracemalloc
 from src.interface.protocol import EconomyProtocol
 
 def run_graph_stress_test():
@@ -18,16 +17,16 @@ def run_graph_stress_test():
     print(f"Scenario 1: Complex DAG with {num_tasks} tasks and 5-10 dependencies each.")
     
     task_ids = []
-    process = psutil.Process(os.getpid())
-    start_mem = process.memory_info().rss / 1024 / 1024 # MB
-    
     start_time = time.time()
     
+    # Task ids are known up front, so the whole DAG is described first
+    # and submitted in one batch
+    task_data_list = []
     for i in range(num_tasks):
-        # Pick random dependencies from already created tasks (ensuring DAG)
-        possible_deps = task_ids[:]
-        num_deps = min(len(possible_deps), random.randint(5, 10))
-        causal_deps = random.sample(possible_deps, num_deps) if possible_deps else []
+        # Pick random dependencies from already created tasks (ensuring DAG);
+        # random.sample doesn't modify its population, so no copy of task_ids is needed
+        num_deps = min(len(task_ids), random.randint(5, 10))
+        causal_deps = random.sample(task_ids, num_deps) if task_ids else []
         
         # Add some external dependencies to test risk factor
         if random.random() < 0.3:
@@ -43,27 +42,34 @@ def run_graph_stress_test():
                 "causal_dependencies": causal_deps
             }
         }
-        tid = protocol.submit_task(task_data)
-        task_ids.append(tid)
+        task_data_list.append(task_data)
+        task_ids.append(task_data["id"])
+
+    task_ids = protocol.submit_tasks_batch(task_data_list)
 
     end_submit_time = time.time()
     
     # Calculate Surplus
     print("Calculating surplus for the cluster...")
-    t0 = time.time()
+    # Heap allocations are traced only around the surplus computation,
+    # so tracing overhead stays out of the submission timing
+    tracemalloc.start()
     try:
+        t0 = time.time()
         surplus_result = protocol.compute_cooperative_surplus("cluster-dag-1", task_ids)
         t1 = time.time()
         
-        end_mem = process.memory_info().rss / 1024 / 1024 # MB
+        _, peak_mem = tracemalloc.get_traced_memory()
         
         print(f"DAG Submission Duration: {end_submit_time - start_time:.2f}s")
         print(f"Surplus Calculation Duration: {t1 - t0:.4f}s")
-        print(f"Memory Usage Increase: {end_mem - start_mem:.2f} MB")
+        print(f"Peak Traced Memory (Surplus Calculation): {peak_mem / 1024 / 1024:.2f} MB")
         print(f"Total Surplus: {surplus_result['total_surplus']}")
         print(f"Internal Dependencies: {surplus_result.get('metadata', {}).get('internal_dependencies', 'N/A')}")
     except Exception as e:
         print(f"FAIL: Surplus calculation failed: {e}")
+    finally:
+        tracemalloc.stop()
 
     # 2. Circular Dependencies
     print("\nScenario 2: Circular Dependencies (A -> B -> C -> A)")
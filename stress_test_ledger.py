@@ -1,12 +1,12 @@
+import io
 import time
-import uuid
 import random
 import threading
 import concurrent.futures
 from src.engine.ledger import ContextualizedLedgerEngine
 from src.engine.cooperation import CooperativeInvestingEngine
 from src.engine.surplus import CooperativeSurplusEngine
-from src.models.impact import ImpactVector, ImpactCategory
+from src.models.impact import ImpactVector, ImpactCategory, IMPACT_CATEGORIES
 from src.models.ledger import CreditProvenance, CreditEntry, EntryType
 
 def run_ledger_integrity_test():
@@ -23,7 +23,14 @@ def run_ledger_integrity_test():
     
     # Pre-generate some agent IDs
     agent_ids = [f"agent_{i}" for i in range(1000)]
-    categories = list(ImpactCategory)
+    categories = IMPACT_CATEGORIES
+
+    # Draw every pair's agent, amount and category up front
+    pairs_per_event = num_entries_per_event // 2
+    num_pairs = num_events * pairs_per_event
+    agent_draws = random.choices(agent_ids, k=num_pairs)
+    category_draws = random.choices(categories, k=num_pairs)
+    amount_draws = [round(random.uniform(10.0, 1000.0), 2) for _ in range(num_pairs)]
     
     for i in range(num_events):
         cluster_id = f"cluster_{i}"
@@ -31,11 +38,13 @@ def run_ledger_integrity_test():
             surplus_event_id=cluster_id,
             task_ids=[f"task_{i}_{j}" for j in range(3)]
         )
+        batch = []
         
-        for j in range(num_entries_per_event // 2):
-            agent_id = random.choice(agent_ids)
-            amount = round(random.uniform(10.0, 1000.0), 2)
-            category = random.choice(categories)
+        for j in range(pairs_per_event):
+            pair = i * pairs_per_event + j
+            agent_id = agent_draws[pair]
+            amount = amount_draws[pair]
+            category = category_draws[pair]
             
             impact = ImpactVector(
                 category=category,
@@ -45,8 +54,9 @@ def run_ledger_integrity_test():
             )
             
             # Credit Agent
+            # Sequential ids: unique within the run, without a uuid4 call per entry
             credit = CreditEntry(
-                entry_id=str(uuid.uuid4()),
+                entry_id=f"e_{pair}_c",
                 agent_id=agent_id,
                 amount=amount,
                 entry_type=EntryType.CREDIT,
@@ -57,7 +67,7 @@ def run_ledger_integrity_test():
             
             # Debit System
             debit = CreditEntry(
-                entry_id=str(uuid.uuid4()),
+                entry_id=f"e_{pair}_d",
                 agent_id=engine.SYSTEM_ACCOUNT,
                 amount=-amount,
                 entry_type=EntryType.DEBIT,
@@ -66,8 +76,11 @@ def run_ledger_integrity_test():
                 provenance=provenance
             )
             
-            engine._add_entry(credit)
-            engine._add_entry(debit)
+            batch.append(credit)
+            batch.append(debit)
+
+        # One bulk insert per event, as the ledger does for a negotiated batch
+        engine._add_entries_bulk(batch)
             
         if (i + 1) % 10000 == 0:
             print(f"  Processed {i + 1} events ({(i + 1) * 20} entries)...")
@@ -107,16 +120,18 @@ def run_concurrency_race_condition_test():
     impact = ImpactVector(ImpactCategory.TECHNICAL, 1000000.0, 1.0, (900000.0, 1100000.0))
     prov = CreditProvenance(surplus_event_id="INITIAL_MINT")
     
-    # Mint 1,000,000 credits to rich_agent
-    ledger._add_entry(CreditEntry(
-        entry_id="mint_credit", agent_id=agent_id, amount=1000000.0, 
-        entry_type=EntryType.CREDIT, impact_vector=impact, domain_context=ImpactCategory.TECHNICAL,
-        provenance=prov
-    ))
-    ledger._add_entry(CreditEntry(
-        entry_id="mint_debit", agent_id=ledger.SYSTEM_ACCOUNT, amount=-1000000.0, 
-        entry_type=EntryType.DEBIT, impact_vector=impact, domain_context=ImpactCategory.TECHNICAL,
-        provenance=prov
+    # Mint 1,000,000 credits to rich_agent (both sides in one write)
+    ledger._add_entries_bulk((
+        CreditEntry(
+            entry_id="mint_credit", agent_id=agent_id, amount=1000000.0, 
+            entry_type=EntryType.CREDIT, impact_vector=impact, domain_context=ImpactCategory.TECHNICAL,
+            provenance=prov
+        ),
+        CreditEntry(
+            entry_id="mint_debit", agent_id=ledger.SYSTEM_ACCOUNT, amount=-1000000.0, 
+            entry_type=EntryType.DEBIT, impact_vector=impact, domain_context=ImpactCategory.TECHNICAL,
+            provenance=prov
+        )
     ))
     
     print(f"Initial balance for {agent_id}: {ledger.get_agent_balance(agent_id).total_balance}")
@@ -127,11 +142,9 @@ def run_concurrency_race_condition_test():
     amount_per_alloc = 10.0
     
     def worker():
-        success_count = 0
-        for _ in range(allocations_per_thread):
-            if coop.allocate_credits_to_fund(fund_id, agent_id, amount_per_alloc):
-                success_count += 1
-        return success_count
+        # One batched call per thread; the engine takes its lock once per batch
+        results = coop.allocate_credits_to_fund_many(fund_id, agent_id, [amount_per_alloc] * allocations_per_thread)
+        return sum(results)
 
     print(f"Starting {num_threads} threads for concurrent allocation...")
     with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
@@ -170,18 +183,21 @@ def run_concurrency_race_condition_test():
 if __name__ == "__main__":
     import sys
     original_stdout = sys.stdout
+    # Output is collected in memory and written to the log once at the end
+    buffer = io.StringIO()
     try:
-        with open("stress_test_ledger.log", "w") as f:
-            sys.stdout = f
-            r1 = run_ledger_integrity_test()
-            r2 = run_concurrency_race_condition_test()
-            
-            if r1 and r2:
-                print("\nALL LEDGER STRESS TESTS PASSED")
-            else:
-                print("\nSOME TESTS FAILED")
+        sys.stdout = buffer
+        r1 = run_ledger_integrity_test()
+        r2 = run_concurrency_race_condition_test()
+        
+        if r1 and r2:
+            print("\nALL LEDGER STRESS TESTS PASSED")
+        else:
+            print("\nSOME TESTS FAILED")
     finally:
         sys.stdout = original_stdout
+        with open("stress_test_ledger.log", "w") as f:
+            f.write(buffer.getvalue())
     
     # Also print to terminal so I can see it's done
     print("Stress test completed. Results in stress_test_ledger.log")
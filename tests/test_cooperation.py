@@ -66,11 +66,19 @@ class TestCooperativeInvesting(unittest.TestCase):
         # Check balances
         self.assertEqual(self.ledger.get_agent_balance(self.agent_a).total_balance, 60.0)
         self.assertEqual(self.ledger.get_agent_balance(self.agent_b).total_balance, 40.0)
+        self.assertEqual(self.ledger.get_agent_total(self.agent_a), 60.0)
+        self.assertEqual(self.ledger.get_agent_total("unknown_agent"), 0.0)
         
         # Check fund balance
         self.assertEqual(fund.total_pooled, 100.0)
         self.assertEqual(self.ledger.get_agent_balance("FUND_eco_boost_2026").total_balance, 100.0)
 
+        self.assertEqual([c.agent_id for c in fund.top_contributions(1)], [self.agent_b])
+
+        # The pooled total follows removals as well
+        fund.remove_contribution(fund.contributions[0])
+        self.assertEqual(fund.total_pooled, 60.0)
+
     def test_insufficient_balance(self):
         objective = ImpactVector(ImpactCategory.RESEARCH, 10.0, 1.0, (9, 11))
         self.investing_engine.create_fund("small_fund", objective)
@@ -80,6 +88,11 @@ class TestCooperativeInvesting(unittest.TestCase):
         self.assertFalse(success)
         self.assertEqual(self.ledger.get_agent_balance(self.agent_a).total_balance, 100.0)
 
+        # Batched allocations see the balance left by earlier ones in the batch
+        results = self.investing_engine.allocate_credits_to_fund_many("small_fund", self.agent_a, [60.0, 60.0, 30.0])
+        self.assertEqual(results, [True, False, True])
+        self.assertEqual(self.ledger.get_agent_total(self.agent_a), 10.0)
+
     def test_investment_evaluation(self):
         # Create and pool
         objective = ImpactVector(ImpactCategory.TECHNICAL, 1000.0, 1.0, (800, 1200))
@@ -116,6 +129,27 @@ class TestCooperativeInvesting(unittest.TestCase):
         self.assertLess(evaluation.risk_score, 0.3)
         self.assertEqual(evaluation.recommendation, "ALLOCATE")
 
+    def test_zero_surplus_evaluation(self):
+        objective = ImpactVector(ImpactCategory.TECHNICAL, 100.0, 1.0, (90, 110))
+        self.investing_engine.create_fund("idle_fund", objective)
+
+        projections = [
+            ImpactProjection(
+                task_id="task_idle",
+                target_vector=ImpactVector(ImpactCategory.TECHNICAL, 1.0, 1.0, (0.5, 1.5)),
+                distribution_mean=0.0,
+                distribution_std=0.0,
+                confidence_interval=(0.0, 0.0),
+                metadata={"agent_id": "agent_x", "agent_role": "dev"}
+            )
+        ]
+
+        # Empty fund and zero expected surplus: no return, maximal confidence risk
+        evaluation = self.investing_engine.evaluate_investment("idle_fund", "cluster_idle", projections)
+        self.assertEqual(evaluation.roci, 0.0)
+        self.assertEqual(evaluation.risk_score, 0.6)
+        self.assertEqual(evaluation.recommendation, "REJECT")
+
     def test_fund_deployment(self):
         objective = ImpactVector(ImpactCategory.REVENUE, 100.0, 1.0, (90, 110))
         fund = self.investing_engine.create_fund("revenue_fund", objective)
@@ -35,6 +35,12 @@ class TestForecastingPipeline(unittest.TestCase):
         self.assertGreater(projection.distribution_std, 0)
         self.assertEqual(len(projection.confidence_interval), 2)
         
+    def test_non_finite_metrics_rejected(self):
+        with self.assertRaises(ValueError):
+            Task(id="t-nan", domain="revenue_deal", metrics={"expected_value": float("nan")})
+        with self.assertRaises(ValueError):
+            Task(id="t-inf", domain="revenue_deal", metrics={"expected_value": float("inf")})
+
     def test_serialization_roundtrip(self):
         task = Task(id="t1", domain="revenue_deal", metrics={"expected_value": 100})
         projection = self.forecaster.project(task)
@@ -66,6 +72,71 @@ class TestForecastingPipeline(unittest.TestCase):
         self.assertIn(ImpactCategory.RESEARCH, categories_in_chain)
         self.assertTrue(len(projection.effect_chain) >= 1)
 
+    def test_causal_rule_changes(self):
+        task = Task(id="task-rules", domain="revenue_deal", metrics={"expected_value": 100, "min": 90, "max": 110})
+
+        # In-place edits are rejected rather than silently ignored
+        with self.assertRaises(TypeError):
+            self.forecaster.causal_rules[ImpactCategory.REVENUE] = [(ImpactCategory.SOCIAL, 1.0, 10.0)]
+
+        # Replacing the rules takes effect on the next projection
+        self.forecaster.causal_rules = {ImpactCategory.REVENUE: [(ImpactCategory.SOCIAL, 1.0, 10.0)]}
+        chain = self.forecaster.project(task).effect_chain
+        self.assertEqual([v.category for v in chain], [ImpactCategory.REVENUE, ImpactCategory.SOCIAL])
+
+        # Single-transition updates show up in the readable rules
+        self.forecaster.update_causal_rule(ImpactCategory.REVENUE, ImpactCategory.SOCIAL, -0.5, 1.0)
+        self.assertEqual(self.forecaster.causal_rules[ImpactCategory.REVENUE], ((ImpactCategory.SOCIAL, 0.5, 11.0),))
+
+    def test_repeated_metrics_translate_independently(self):
+        metrics = {"expected_value": 100, "min": 90, "max": 110}
+        p1 = self.forecaster.project(Task(id="t1", domain="revenue_deal", metrics=metrics))
+        p2 = self.forecaster.project(Task(id="t2", domain="revenue_deal", metrics=dict(metrics)))
+        self.assertEqual(p1.target_vector, p2.target_vector)
+        self.assertIsNot(p1.target_vector, p2.target_vector)
+
+        # Each projection owns its vector's containers
+        p1.target_vector.metrics["recurring"] = True
+        self.assertFalse(p2.target_vector.metrics["recurring"])
+
+        deps = {"expected_value": 100, "causal_dependencies": ["t1"]}
+        p3 = self.forecaster.project(Task(id="t3", domain="revenue_deal", metrics=deps))
+        self.assertEqual(p3.target_vector.causal_dependencies, ["t1"])
+
+        # A replaced mapper applies to later projections
+        self.registry.register_metric("revenue_deal", lambda data: ImpactVector(ImpactCategory.REVENUE, 500.0, 1.0, (400, 600)))
+        p4 = self.forecaster.project(Task(id="t4", domain="revenue_deal", metrics=dict(metrics)))
+        self.assertEqual(p4.target_vector.magnitude, 500.0)
+
+    def test_seeded_projection_is_reproducible(self):
+        task = Task(id="task-003", domain="research_project", metrics={"novelty_score": 5.0})
+        p1 = ForecastingLayer(self.registry, seed=42).project(task)
+        p2 = ForecastingLayer(self.registry, seed=42).project(task)
+        self.assertEqual(p1.distribution_mean, p2.distribution_mean)
+        self.assertEqual(p1.distribution_std, p2.distribution_std)
+        self.assertEqual([v.magnitude for v in p1.effect_chain], [v.magnitude for v in p2.effect_chain])
+
+    def test_batch_projection_matches_sequential(self):
+        tasks = [
+            Task(id="t1", domain="revenue_deal", metrics={"expected_value": 100}),
+            Task(id="t2", domain="research_project", metrics={"novelty_score": 5.0})
+        ]
+        batch = ForecastingLayer(self.registry, seed=7).project_batch(tasks)
+        single = ForecastingLayer(self.registry, seed=7)
+        sequential = [single.project(task) for task in tasks]
+        self.assertEqual([p.task_id for p in batch], ["t1", "t2"])
+        self.assertEqual([p.distribution_mean for p in batch], [p.distribution_mean for p in sequential])
+
+    def test_simulation_budget_and_early_stop(self):
+        # Fixed-bounds revenue has no downstream rules, so the spread is zero
+        stable = Task(id="t-stable", domain="revenue_deal", metrics={"expected_value": 100})
+        self.assertEqual(self.forecaster.project(stable).metadata["simulations"], 16)
+        self.assertEqual(self.forecaster.project(stable, rel_se_target=None).metadata["simulations"], 100)
+
+        volatile = Task(id="t-volatile", domain="research_project", metrics={"novelty_score": 5.0})
+        projection = self.forecaster.project(volatile, simulations=40, rel_se_target=None)
+        self.assertEqual(projection.metadata["simulations"], 40)
+
 
 if __name__ == "__main__":
     unittest.main()
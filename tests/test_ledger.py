@@ -7,6 +7,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from src.models.impact import ImpactProjection, ImpactVector, ImpactCategory, SurplusPool, ContributionClaim
 from src.engine.ledger import ContextualizedLedgerEngine
+from src.models.serialization import dump_entries
+from src.models.ledger import AgentBalance
 
 def test_ledger_flow():
     print("--- Testing Contextualized Credit Ledger ---")
@@ -91,8 +93,17 @@ def test_ledger_flow():
 
     assert balance_alpha.total_balance == 90.0
     assert balance_beta.total_balance == 60.0
+    assert [e.entry_id for e in balance_alpha.recent_entries] == [first_entry_id]
     assert audit['integrity_check'] == "passed"
+
+    # A held balance kept current entry by entry matches the ledger's own view
+    held_alpha = AgentBalance(agent_id="agent-alpha", total_balance=0.0, balances_by_category={})
+    for e in engine.entries:
+        if e.agent_id == "agent-alpha":
+            held_alpha.apply_entry(e)
+    assert held_alpha.snapshot() == balance_alpha
     assert trace['origin_surplus_id'] == cluster_id
+    assert json.loads(dump_entries(engine.entries)) == json.loads(json.dumps([e.to_dict() for e in engine.entries]))
     
     print("\n--- Ledger Test Passed ---")
 
@@ -1,6 +1,6 @@
 import unittest
 from src.models.impact import SurplusPool, ContributionClaim
-from src.engine.negotiation import AutonomousNegotiationEngine
+from src.engine.negotiation import AutonomousNegotiationEngine, as_mapping, round_negotiation_result
 
 class TestNegotiationEngine(unittest.TestCase):
     def setUp(self):
@@ -50,6 +50,11 @@ class TestNegotiationEngine(unittest.TestCase):
         self.assertAlmostEqual(allocations["agent-B"], 290.0, delta=1.0)
         self.assertAlmostEqual(sum(allocations.values()), 1000.0, delta=0.1)
 
+        # Objective targets are only reported on request
+        self.assertNotIn("objective_targets", result)
+        targets = self.engine.negotiate_splits(pool, [claim_a, claim_b], include_targets=True)["objective_targets"]
+        self.assertAlmostEqual(targets["agent-A"], 710.0, places=4)
+
     def test_high_fairness_constraint(self):
         self.engine.fairness_weight = 0.9 # Almost pure egalitarian
         
@@ -73,5 +78,57 @@ class TestNegotiationEngine(unittest.TestCase):
         result = self.engine.negotiate_splits(pool, [])
         self.assertEqual(result["final_allocations"], {})
 
+    def test_history_detail_levels(self):
+        pool = SurplusPool(cluster_id="c3", total_surplus=100.0, confidence_interval=(90, 110), aggregated_vectors={}, task_ids=["t1", "t2"])
+        claims = [
+            ContributionClaim(agent_id="A", cluster_id="c3", marginal_impact_estimate=70.0, uncertainty_margin=5.0, dependency_influence_weight=0.2, task_ids=["t1"]),
+            ContributionClaim(agent_id="B", cluster_id="c3", marginal_impact_estimate=30.0, uncertainty_margin=5.0, dependency_influence_weight=0.2, task_ids=["t2"])
+        ]
+
+        results = {}
+        for detail in ("none", "summary", "full"):
+            engine = AutonomousNegotiationEngine(max_iterations=100, equilibrium_tolerance=1e-7, history_detail=detail)
+            results[detail] = engine.negotiate_splits(pool, claims)
+
+        # The history level never changes the outcome, only what is recorded
+        for detail in ("none", "summary"):
+            self.assertEqual(results[detail]["final_allocations"], results["full"]["final_allocations"])
+            self.assertEqual(results[detail]["rounds_to_convergence"], results["full"]["rounds_to_convergence"])
+
+        self.assertEqual(results["none"]["history"], [])
+        self.assertEqual(len(results["summary"]["history"]), results["summary"]["rounds_to_convergence"])
+        # Summary rounds only carry the deviations the loop computed, always including the last
+        summary_deviations = [entry.deviation_from_objective for entry in results["summary"]["history"]]
+        full_deviations = [entry.deviation_from_objective for entry in results["full"]["history"]]
+        self.assertEqual(summary_deviations[-1], full_deviations[-1])
+        for summary_deviation, full_deviation in zip(summary_deviations, full_deviations):
+            self.assertIn(summary_deviation, (None, full_deviation))
+        self.assertEqual(set(results["full"]["history"][-1].allocations), {"A", "B"})
+        # Full rounds are stamped as the loop runs, so the stamps never go backwards
+        stamps = [entry.timestamp for entry in results["full"]["history"]]
+        self.assertEqual(stamps, sorted(stamps))
+
+        with self.assertRaises(ValueError):
+            AutonomousNegotiationEngine(history_detail="verbose")
+
+    def test_unkeyed_allocations(self):
+        pool = SurplusPool(cluster_id="c4", total_surplus=100.0, confidence_interval=(90, 110), aggregated_vectors={}, task_ids=["t1", "t2"])
+        claims = [
+            ContributionClaim(agent_id="A", cluster_id="c4", marginal_impact_estimate=70.0, uncertainty_margin=5.0, dependency_influence_weight=0.2, task_ids=["t1"]),
+            ContributionClaim(agent_id="B", cluster_id="c4", marginal_impact_estimate=30.0, uncertainty_margin=5.0, dependency_influence_weight=0.2, task_ids=["t2"])
+        ]
+
+        keyed = self.engine.negotiate_splits(pool, claims)
+        unkeyed = self.engine.negotiate_splits(pool, claims, keyed_allocations=False)
+
+        # The keyed mapping is only built on request, and as_mapping rebuilds it from the sequences
+        self.assertNotIn("final_allocations", unkeyed)
+        self.assertEqual(as_mapping(unkeyed), keyed["final_allocations"])
+        self.assertEqual(as_mapping(keyed), keyed["final_allocations"])
+        self.assertEqual(
+            round_negotiation_result(unkeyed)["final_allocations"],
+            round_negotiation_result(keyed)["final_allocations"]
+        )
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,8 @@
+import json
 import unittest
-from src.models.impact import ImpactVector, ImpactCategory
+from src.models.impact import ImpactVector, ImpactCategory, ImpactProjection, Bounds
 from src.models.registry import ImpactMetricRegistry, revenue_mapper
+from src.models.registry_cache import CachedRegistry
 
 class TestImpactOntology(unittest.TestCase):
     def test_impact_vector_creation(self):
@@ -14,6 +16,56 @@ class TestImpactOntology(unittest.TestCase):
         self.assertEqual(vector.category, ImpactCategory.EFFICIENCY)
         self.assertEqual(vector.magnitude, 10.5)
 
+    def test_bulk_vector_creation(self):
+        vectors = ImpactVector.bulk_create(
+            categories=[ImpactCategory.REVENUE, ImpactCategory.SOCIAL],
+            magnitudes=[3.0, 4.0],
+            time_horizons=[1.0, 2.0],
+            uncertainty_bounds=[(2.0, 4.0), (3.0, 5.0)]
+        )
+        self.assertEqual(vectors[1], ImpactVector(ImpactCategory.SOCIAL, 4.0, 2.0, (3.0, 5.0)))
+        self.assertIsNot(vectors[0].metrics, vectors[1].metrics)
+
+        # Validation still applies to every row
+        with self.assertRaises(ValueError):
+            ImpactVector.bulk_create([ImpactCategory.REVENUE], [-1.0], [1.0], [(0.0, 1.0)])
+
+        # Mismatched columns are rejected rather than silently truncated
+        with self.assertRaises(ValueError):
+            ImpactVector.bulk_create([ImpactCategory.REVENUE, ImpactCategory.SOCIAL], [3.0], [1.0, 2.0], [(2.0, 4.0), (3.0, 5.0)])
+        with self.assertRaises(ValueError):
+            ImpactVector.bulk_create([ImpactCategory.REVENUE], [3.0], [1.0], [(2.0, 4.0)], metrics=[{}, {}])
+
+    def test_vector_interning(self):
+        first = ImpactVector(ImpactCategory.RESEARCH, 5.0, 2.0, (4.0, 6.0))
+        second = ImpactVector(ImpactCategory.RESEARCH, 5.0, 2.0, (4.0, 6.0))
+        self.assertEqual(hash(first), hash(second))
+        self.assertIs(ImpactVector.intern(first), ImpactVector.intern(second))
+        self.assertIsNot(ImpactVector.intern(first), ImpactVector.intern(ImpactVector(ImpactCategory.RESEARCH, 5.0, 3.0, (4.0, 6.0))))
+
+        # Vectors holding dependencies, weights or metrics are never shared
+        with_deps = ImpactVector(ImpactCategory.RESEARCH, 5.0, 2.0, (4.0, 6.0), ["t1"])
+        self.assertIs(ImpactVector.intern(with_deps), with_deps)
+        self.assertIsNot(ImpactVector.intern(ImpactVector(ImpactCategory.RESEARCH, 5.0, 2.0, (4.0, 6.0), ["t1"])), with_deps)
+
+        with self.assertRaises(AttributeError):
+            first.magnitude = 1.0
+
+    def test_projection_round_trip(self):
+        effect = ImpactVector(ImpactCategory.SOCIAL, 2.0, 3.0, (1.5, 2.5))
+        projection = ImpactProjection("task-1", effect, 2.0, 0.2, (1.8, 2.2), effect_chain=[effect, effect])
+        restored = ImpactProjection.from_dict(projection.to_dict())
+        self.assertEqual(restored, projection)
+        self.assertIsInstance(restored.confidence_interval, Bounds)
+        self.assertEqual(restored.target_vector.uncertainty_bounds.hi, 2.5)
+
+        # Chain vectors with their own containers stay separate across projections
+        linked = ImpactVector(ImpactCategory.SOCIAL, 2.0, 3.0, (1.5, 2.5), metrics={"reach": 1})
+        encoded = json.dumps(ImpactProjection("task-2", effect, 2.0, 0.2, (1.8, 2.2), effect_chain=[linked]).to_dict())
+        one, other = ImpactProjection.from_dict(json.loads(encoded)), ImpactProjection.from_dict(json.loads(encoded))
+        one.effect_chain[0].metrics["reach"] = 2
+        self.assertEqual(other.effect_chain[0].metrics["reach"], 1)
+
     def test_registry_translation(self):
         registry = ImpactMetricRegistry()
         registry.register_metric("revenue_deal", revenue_mapper)
@@ -31,5 +83,34 @@ class TestImpactOntology(unittest.TestCase):
         self.assertEqual(vector.magnitude, 5000)
         self.assertTrue(vector.metrics["recurring"])
 
+        idx = registry.get_index("revenue_deal")
+        self.assertEqual(registry.translate_by_idx(idx, raw_data), vector)
+
+        registry.freeze()
+        with self.assertRaises(ValueError):
+            registry.register_metric("other", revenue_mapper)
+        with self.assertRaises(ValueError):
+            registry.translate("unknown", raw_data)
+
+    def test_cached_registry(self):
+        registry = CachedRegistry(maxsize=2)
+        registry.register_metric("revenue_deal", revenue_mapper)
+
+        template = {"expected_value": 100, "min": 50, "max": 150}
+        first = registry.translate("revenue_deal", template)
+        self.assertIs(registry.translate("revenue_deal", dict(template)), first)
+
+        # Unhashable values are never conflated with the cached template
+        with_deps = dict(template, causal_dependencies=["t1"])
+        self.assertEqual(registry.translate("revenue_deal", with_deps).causal_dependencies, ["t1"])
+
+        # Equal values of different types get separate entries
+        self.assertIs(registry.translate("revenue_deal", {"expected_value": True}).magnitude, True)
+        self.assertIs(type(registry.translate("revenue_deal", {"expected_value": 1}).magnitude), int)
+
+        batch = registry.translate_batch("revenue_deal", [template, {"expected_value": 7}, template])
+        self.assertIs(batch[0], batch[2])
+        self.assertEqual(batch[1].magnitude, 7)
+
 if __name__ == "__main__":
     unittest.main()
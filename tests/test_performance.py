@@ -1,5 +1,6 @@
+import json
 import unittest
-from src.models.agent import Agent, PerformanceSignature
+from src.models.agent import Agent, PerformanceSignature, get_trust_scores, get_trust_scores_sigmoid, update_performance_batch
 from src.models.impact import ImpactProjection, ImpactVector, ImpactCategory
 from src.engine.valuation import ValuationEngine
 
@@ -25,6 +26,11 @@ class TestPerformanceEmbeddings(unittest.TestCase):
         self.assertGreater(embedding[0], 0.9) # accuracy
         self.assertLess(embedding[1], 0.1)    # deviation
 
+        # Cached until the signature changes
+        self.assertIs(self.star_agent.performance.generate_embedding(), embedding)
+        self.star_agent.performance.update_performance(100.0, 100.0, True, "technical")
+        self.assertIsNot(self.star_agent.performance.generate_embedding(), embedding)
+
     def test_trust_score(self):
         star_score = self.star_agent.performance.get_trust_score("technical")
         rookie_score = self.rookie_agent.performance.get_trust_score("technical")
@@ -57,6 +63,12 @@ class TestPerformanceEmbeddings(unittest.TestCase):
         print(f"\nStar Agent Adjusted Mean: {star_adjusted.distribution_mean}")
         print(f"Rookie Agent Adjusted Mean: {rookie_adjusted.distribution_mean}")
 
+        # Adjusted projections serialize like any other projection
+        restored = json.loads(json.dumps(star_adjusted.to_dict()))
+        self.assertEqual(restored["metadata"]["domain"], "technical")
+        self.assertEqual(restored["metadata"]["agent_id"], self.star_agent.id)
+        self.assertEqual(ImpactProjection.from_dict(restored).metadata, dict(star_adjusted.metadata))
+
     def test_agent_ranking(self):
         vector = ImpactVector(ImpactCategory.TECHNICAL, 100.0, 30.0, (90, 110))
         projection = ImpactProjection(
@@ -89,6 +101,52 @@ class TestPerformanceEmbeddings(unittest.TestCase):
         bad_trust = agent.performance.get_trust_score("technical")
         self.assertLess(bad_trust, new_trust)
 
+    def test_batch_performance_update(self):
+        batched = Agent.create("agent-004", "learner").performance
+        single = Agent.create("agent-005", "learner").performance
+        update_performance_batch([batched, batched], [100.0, 100.0], [80.0, 130.0], [True, False], ["technical", "technical"])
+        single.update_performance(100.0, 80.0, True, "technical")
+        single.update_performance(100.0, 130.0, False, "technical")
+        self.assertEqual(batched.generate_embedding(), single.generate_embedding())
+        self.assertEqual(batched.task_count, 2)
+
+    def test_batch_trust_scores(self):
+        signatures = [self.star_agent.performance, self.rookie_agent.performance]
+        self.assertEqual(
+            get_trust_scores(signatures, "technical"),
+            [s.get_trust_score("technical") for s in signatures]
+        )
+
+    def test_sigmoid_trust_scores(self):
+        signatures = [self.star_agent.performance, self.rookie_agent.performance]
+        star, rookie = get_trust_scores_sigmoid(signatures, "technical")
+        linear_star, linear_rookie = get_trust_scores(signatures, "technical")
+        # Same ordering as the linear score, strictly inside (0, 1)
+        self.assertEqual(star > rookie, linear_star > linear_rookie)
+        for score in (star, rookie):
+            self.assertGreater(score, 0.0)
+            self.assertLess(score, 1.0)
+
+    def test_trust_cache_invalidation(self):
+        performance = self.rookie_agent.performance
+        cached = performance.get_trust_score("technical")
+        self.assertEqual(performance.get_trust_score("technical"), cached)
+
+        # Reassigning a metric must not serve the stale cached score
+        performance.prediction_accuracy = 0.95
+        self.assertGreater(performance.get_trust_score("technical"), cached)
+
+        # So must a single-domain reliability update
+        cached = performance.get_trust_score("technical")
+        embedding = performance.generate_embedding()
+        performance.set_domain_reliability("technical", 0.9)
+        self.assertGreater(performance.get_trust_score("technical"), cached)
+        self.assertGreater(performance.generate_embedding()[3], embedding[3])
+
+        # Writing through the reliability view fails instead of going stale
+        with self.assertRaises(TypeError):
+            performance.domain_reliability["technical"] = 0.1
+
 if __name__ == "__main__":
 
     unittest.main()
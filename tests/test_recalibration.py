@@ -32,6 +32,21 @@ class TestRecalibration(unittest.TestCase):
         # Assuming alpha=0.2 in Agent.update_performance
         self.assertAlmostEqual(agent.performance.impact_deviation, 0.12, places=4)
 
+    def test_agent_reliability_batch_update(self):
+        agent = Agent.create("batch_agent", "coder")
+        target = ImpactVector(ImpactCategory.TECHNICAL, 100.0, 10.0, (90, 110))
+        projection = ImpactProjection("task_1", target, 100.0, 5.0, (90, 110))
+
+        updates = self.recalibration.recalibrate_agent_performance_batch([
+            (agent, projection, 80.0),
+            (agent, projection, 80.0)
+        ])
+
+        # Updates to the same agent apply sequentially: 0.8*0.12 + 0.2*0.2 = 0.136
+        self.assertEqual(len(updates), 2)
+        self.assertAlmostEqual(updates[1]["previous_deviation"], 0.12, places=4)
+        self.assertAlmostEqual(agent.performance.impact_deviation, 0.136, places=4)
+
     def test_synergy_scaling_update(self):
         # Initial multiplier 0.15
         self.assertEqual(self.surplus.synergy_multiplier, 0.15)
@@ -1,5 +1,6 @@
 import unittest
 from src.models.impact import ImpactProjection, ImpactVector, ImpactCategory
+from src.models.impact_batch import ImpactVectorBatch
 from src.engine.surplus import CooperativeSurplusEngine
 
 class TestSurplusEngine(unittest.TestCase):
@@ -209,5 +210,31 @@ class TestSurplusEngine(unittest.TestCase):
         self.assertEqual(claims[0].marginal_impact_estimate, 100.0)
         self.assertEqual(claims[0].dependency_influence_weight, 1.0)
 
+    def test_cluster_surplus_batch(self):
+        v = ImpactVector(ImpactCategory.TECHNICAL, 10.0, 30.0, (9, 11))
+        p1 = ImpactProjection("t1", v, 100.0, 10.0, (80.4, 119.6), metadata={"agent_role": "coder"})
+        p2 = ImpactProjection("t2", v, 50.0, 5.0, (40.2, 59.8), metadata={"agent_role": "analyst"})
+
+        pools = self.engine.calculate_cluster_surplus_batch(["c1", "c2", "c3"], [[p1], [p1, p2], []])
+        self.assertEqual([pool.cluster_id for pool in pools], ["c1", "c2", "c3"])
+        single = self.engine.calculate_cluster_surplus("c2", [p1, p2])
+        self.assertEqual(pools[1].total_surplus, single.total_surplus)
+        self.assertEqual(pools[1].metadata, single.metadata)
+        self.assertEqual(pools[2].total_surplus, 0.0)
+
+        with self.assertRaises(ValueError):
+            self.engine.calculate_cluster_surplus_batch(["c1"], [])
+
+    def test_category_aggregation_batch(self):
+        batch = ImpactVectorBatch.from_vectors([
+            ImpactVector(ImpactCategory.RESEARCH, 10.0, 1.0, (5, 15)),
+            ImpactVector(ImpactCategory.TECHNICAL, 4.0, 1.0, (2, 6)),
+            ImpactVector(ImpactCategory.RESEARCH, 2.5, 1.0, (1, 4))
+        ])
+        self.assertEqual(len(batch), 3)
+        totals = batch.totals_by_category_name()
+        self.assertEqual(list(totals), ["RESEARCH", "TECHNICAL"])
+        self.assertEqual(totals["RESEARCH"], 12.5)
+
 if __name__ == "__main__":
     unittest.main()